@@ -1,27 +1,46 @@
 from __future__ import annotations
 
+import ast
+import asyncio
+import hashlib
 import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
 import typing
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
 
-from bs4 import BeautifulSoup
+import pydantic_core
 from pydantic import BaseModel, Field
-from pydantic_ai import Agent, ModelRetry, RunContext
+from pydantic_ai import Agent, ModelRetry, RunContext, Tool
+from pydantic_ai.exceptions import UsageLimitExceeded
+from pydantic_ai.usage import UsageLimits
 
 from selectron.ai.codegen_prompt import CODEGEN_PROMPT
 from selectron.ai.codegen_utils import (
     clean_agent_code,
+    key_columns,
     validate_cross_key_duplicates,
     validate_empty_columns,
     validate_identical_columns,
     validate_internal_repetition,
     validate_naive_text_match,
+    validate_parser_code_shape,
     validate_redundant_key_pairs,
     validate_result,
     validate_text_representation,
 )
-from selectron.util.get_app_dir import get_app_dir
+from selectron.parse.execution import ParserCodeError, run_parser_code
+from selectron.util.compact_html import compact_html
+from selectron.util.get_app_dir import get_app_dir, get_cache_dir
+from selectron.util.json_cache import read_cache_entry, write_cache_entry
 from selectron.util.logger import get_logger
 from selectron.util.model_config import ModelConfig
 from selectron.util.sample_items import sample_items
@@ -29,6 +48,80 @@ from selectron.util.slugify_url import slugify_url
 
 logger = get_logger(__name__)
 
+# Validated outputs per (candidate code, samples), so repeat sessions skip the whole run
+CODEGEN_CACHE_DIR_NAME = "codegen"
+CODEGEN_CACHE_MAX_ENTRIES = 256
+# Final (code, outputs) per (site, selector, sample set): a repeat request skips the agent
+CODEGEN_RUN_CACHE_DIR_NAME = "codegen_runs"
+# Part of the run cache key; bump when the validators change what counts as a good parser
+CODEGEN_RUN_CACHE_VERSION = 1
+
+# Candidate code runs in worker processes only: samples run in parallel without the GIL bs4
+# holds, and a runaway candidate (in parse_element or at module level) can be killed.
+# Each worker is a single-process pool; a candidate checks out its own workers, so killing
+# them can't touch another candidate's samples, and idle ones are kept warm for the next.
+_SAMPLE_WORKERS = min(8, os.cpu_count() or 4)
+_idle_sample_workers: List[ProcessPoolExecutor] = []
+_idle_sample_workers_lock = threading.Lock()
+# Wall-clock budget for one candidate over all its samples; a runaway loop fails the candidate
+CANDIDATE_TIMEOUT_S = 20.0
+# Bounds on one whole agent run (model turns included); past either, the last candidate that
+# passed validation is used, if there is one
+AGENT_RUN_TIMEOUT_S = 300.0
+AGENT_REQUEST_LIMIT = 20
+
+
+def _silence_sample_worker() -> None:
+    """Worker initializer: candidate prints and warnings must not reach the app's terminal."""
+    # the app only captures its own sys.stdout; a spawned worker inherits the real fds
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    for fd in (1, 2):
+        os.dup2(devnull, fd)
+    os.close(devnull)
+    sys.stdout = open(os.devnull, "w")
+    sys.stderr = open(os.devnull, "w")
+    warnings.simplefilter("ignore")
+
+
+def _checkout_sample_workers(count: int) -> List[ProcessPoolExecutor]:
+    with _idle_sample_workers_lock:
+        workers = [_idle_sample_workers.pop() for _ in range(min(count, len(_idle_sample_workers)))]
+    while len(workers) < count:
+        # spawned: the app process runs threads
+        workers.append(
+            ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_silence_sample_worker,
+            )
+        )
+    return workers
+
+
+def _return_sample_workers(workers: List[ProcessPoolExecutor]) -> None:
+    with _idle_sample_workers_lock:
+        keep = max(0, _SAMPLE_WORKERS - len(_idle_sample_workers))
+        _idle_sample_workers.extend(workers[:keep])
+    for worker in workers[keep:]:
+        worker.shutdown(wait=False)
+
+
+def _terminate_sample_workers(workers: List[ProcessPoolExecutor]) -> None:
+    """Kill workers stuck in (or broken by) a candidate; later candidates get fresh ones."""
+    for worker in workers:
+        processes = getattr(worker, "_processes", None) or {}  # no public kill before 3.14
+        for process in list(processes.values()):
+            process.terminate()
+        worker.shutdown(wait=True, cancel_futures=True)
+
+
+def _warm_up_sample_workers(count: int) -> None:
+    """Start worker processes ahead of the first candidate (spawning one takes a while)."""
+    workers = _checkout_sample_workers(count)
+    for future in [worker.submit(int) for worker in workers]:
+        future.result()
+    _return_sample_workers(workers)
+
 
 class CodegenAgent:
     class _CodeEvaluationResult(BaseModel):
@@ -60,6 +153,8 @@ class CodegenAgent:
         input_selector: Optional[str] = None,
         input_selector_description: Optional[str] = None,
         status_cb: Optional[StatusCallback] = None,  # <-- Add status callback
+        verbose: bool = False,
+        use_cache: bool = True,
     ):
         if not html_samples:
             raise ValueError("html_samples must be a non-empty list")
@@ -67,12 +162,22 @@ class CodegenAgent:
             raise ValueError("base_url must be provided if save_results is True")
 
         self.html_samples = html_samples
+        # the agent loop runs on distinct samples only; duplicates add parse work, not information
+        self._unique_samples = list(dict.fromkeys(html_samples))
         self.model_cfg = model_cfg or ModelConfig()
         self.save_results = save_results
         self.base_url = base_url
         self.input_selector = input_selector
         self.input_selector_description = input_selector_description
         self.status_cb = status_cb  # <-- Store status callback
+        # attach tracebacks of failing candidate code to the log (the feedback already names the error)
+        self.verbose = verbose
+        # reuse the parser from an earlier run over the same site, selector and samples
+        self.use_cache = use_cache
+        # per-run tool state: (code, outputs) of the latest candidate that passed validation,
+        # and the background start of the sample workers
+        self._last_good: Optional[Tuple[str, List[Dict[str, Any]]]] = None
+        self._warmup_task: Optional[asyncio.Task[None]] = None
 
         # Determine the correct directory to save parsers
         self.parser_save_dir: Optional[Path] = None
@@ -109,131 +214,308 @@ class CodegenAgent:
         self, code: str, html_samples_inner: List[str]
     ) -> Tuple[bool, str, List[Dict[str, Any]]]:
         """Execute candidate code in a sandbox and run parse_element over samples."""
-        sandbox: Dict[str, Any] = {"BeautifulSoup": BeautifulSoup, "json": json}
+        cache_path = self._disk_cache_path(code, html_samples_inner)
+        cached_outputs = self._load_cached_outputs(cache_path)
+        if cached_outputs is not None:
+            logger.debug(f"Reusing cached outputs for candidate code from {cache_path.name}")
+            return True, "success", cached_outputs
+
+        # identical samples give identical results: run each distinct one once, fan out after
+        unique_samples = list(dict.fromkeys(html_samples_inner))
+
         try:
-            compiled = compile(code, "<agent_code>", "exec")
+            tree = ast.parse(code, "<agent_code>")
         except SyntaxError as e:
             feedback = f"syntax error: {e.msg} (line {e.lineno})"
             logger.warning(feedback)
             return False, feedback, []
-        try:
-            exec(compiled, sandbox)
-        except Exception as e:  # Granular exceptions handled by sandbox code itself
-            feedback = f"runtime error during exec: {type(e).__name__}: {e}"
-            logger.warning(feedback, exc_info=True)
-            return False, feedback, []
-        parse_fn = sandbox.get("parse_element")
-        if not callable(parse_fn):
-            feedback = "function `parse_element(html: str) -> dict` not found"
-            logger.warning(feedback)
-            return False, feedback, []
+        # obviously wrong candidates are rejected before any of their code runs
+        shape_problem = validate_parser_code_shape(tree)
+        if shape_problem is not None:
+            logger.warning(shape_problem)
+            return False, shape_problem, []
 
-        outputs: List[Dict[str, Any]] = []
-        for idx, html in enumerate(html_samples_inner):
-            try:
-                result = parse_fn(html)
-            except Exception as e:  # pragma: no cover – we still capture & validate
-                feedback = (
-                    f"error when calling parse_element on sample {idx}: {type(e).__name__}: {e}"
+        # workers exec the source themselves (module-level code included, under the deadline)
+        workers = _checkout_sample_workers(min(_SAMPLE_WORKERS, len(unique_samples)))
+        futures = [
+            workers[i % len(workers)].submit(run_parser_code, code, html)
+            for i, html in enumerate(unique_samples)
+        ]
+        # one slot per sample, filled by index (every slot is set once the loop completes)
+        outputs: List[Optional[Dict[str, Any]]] = [None] * len(futures)
+        deadline = time.monotonic() + CANDIDATE_TIMEOUT_S
+        try:
+            # collect in sample order so the reported failure is the one a sequential run would hit
+            for unique_idx, future in enumerate(futures):
+                idx = unique_idx  # position in html_samples_inner, for feedback
+                if len(unique_samples) != len(html_samples_inner):
+                    idx = html_samples_inner.index(unique_samples[unique_idx])
+                try:
+                    result = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except FuturesTimeoutError:
+                    feedback = (
+                        f"code did not finish on sample {idx} within {CANDIDATE_TIMEOUT_S:g}s "
+                        "(infinite loop or far too slow?)"
+                    )
+                    logger.warning(feedback)
+                    return False, feedback, []
+                except ParserCodeError as e:  # exec failed or no parse_element
+                    feedback = str(e)
+                    logger.warning(feedback)
+                    return False, feedback, []
+                except Exception as e:  # pragma: no cover – we still capture & validate
+                    feedback = (
+                        f"error when calling parse_element on sample {idx}: {type(e).__name__}: {e}"
+                    )
+                    logger.warning(feedback, exc_info=self.verbose)
+                    return False, feedback, []
+                ok, msg = validate_result(result)
+                if not ok:
+                    feedback = f"invalid return value for sample {idx}: {msg}"
+                    logger.warning(feedback)
+                    return False, feedback, []
+                outputs[unique_idx] = result
+        finally:
+            # drop samples not yet started; a worker still busy (or dead) is not reused
+            for future in futures:
+                future.cancel()
+            reusable: List[ProcessPoolExecutor] = []
+            stuck: List[ProcessPoolExecutor] = []
+            for worker_idx, worker in enumerate(workers):
+                worker_futures = futures[worker_idx :: len(workers)]
+                healthy = all(
+                    future.done()
+                    and (
+                        future.cancelled() or not isinstance(future.exception(), BrokenProcessPool)
+                    )
+                    for future in worker_futures
                 )
-                logger.warning(feedback, exc_info=True)
-                return False, feedback, []
-            ok, msg = validate_result(result)
-            if not ok:
-                feedback = f"invalid return value for sample {idx}: {msg}"
-                logger.warning(feedback)
-                return False, feedback, []
-            # Ensure pyright understands the type after validation
-            outputs.append(typing.cast(Dict[str, Any], result))
-        return True, "success", outputs
+                (reusable if healthy else stuck).append(worker)
+            _return_sample_workers(reusable)
+            _terminate_sample_workers(stuck)
 
-    async def run(self) -> Tuple[str, List[Dict[str, Any]]]:
-        agent = Agent(
+        # Ensure pyright understands the type after validation
+        valid_outputs = typing.cast(List[Dict[str, Any]], outputs)
+        if len(unique_samples) != len(html_samples_inner):
+            output_by_sample = dict(zip(unique_samples, valid_outputs, strict=True))
+            valid_outputs = [output_by_sample[html] for html in html_samples_inner]
+        self._store_cached_outputs(cache_path, valid_outputs)
+        return True, "success", valid_outputs
+
+    @staticmethod
+    def _disk_cache_path(code: str, html_samples_inner: List[str]) -> Path:
+        """Cache file for this code run over exactly these samples (any sample change misses)."""
+        samples_hash = hashlib.sha1()
+        for html in html_samples_inner:
+            samples_hash.update(html.encode())
+            samples_hash.update(b"\0")
+        code_key = hashlib.sha1(code.encode()).hexdigest()
+        file_name = f"{code_key}-{samples_hash.hexdigest()[:16]}.json"
+        return get_cache_dir() / CODEGEN_CACHE_DIR_NAME / file_name
+
+    def _sample_digests(self) -> List[str]:
+        return [hashlib.sha256(html.encode()).hexdigest() for html in self._unique_samples]
+
+    def _run_cache_path(self) -> Path:
+        """Cache file for a whole run: same model, prompt, validators, site, selector and set of
+        samples (order ignored). A change to any of the first three regenerates the parser."""
+        run_hash = hashlib.sha256()
+        fields = [
+            str(CODEGEN_RUN_CACHE_VERSION),
             self.model_cfg.codegen_model,
-            system_prompt=CODEGEN_PROMPT,
+            CODEGEN_PROMPT,
+            self.base_url or "",
+            self.input_selector or "",
+            *sorted(self._sample_digests()),
+        ]
+        for field in fields:
+            encoded = field.encode()
+            run_hash.update(len(encoded).to_bytes(8, "little"))  # unambiguous field boundaries
+            run_hash.update(encoded)
+        return get_cache_dir() / CODEGEN_RUN_CACHE_DIR_NAME / f"{run_hash.hexdigest()}.json"
+
+    def _load_cached_run(self, cache_path: Path) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+        """(code, outputs per unique sample) of an earlier run, in this run's sample order."""
+        entry = read_cache_entry(cache_path)
+        if entry is None:
+            return None
+        code, output_by_digest = entry.get("python"), entry.get("outputs")
+        if not isinstance(code, str) or not isinstance(output_by_digest, dict):
+            return None
+        outputs = [output_by_digest.get(digest) for digest in self._sample_digests()]
+        if not all(isinstance(output, dict) for output in outputs):
+            return None
+        return code, typing.cast(List[Dict[str, Any]], outputs)
+
+    def _store_cached_run(self, cache_path: Path, code: str, outputs: List[Dict[str, Any]]) -> None:
+        # outputs keyed by sample, since a later run may list the same samples in another order
+        output_by_digest = dict(zip(self._sample_digests(), outputs, strict=True))
+        write_cache_entry(
+            cache_path, {"python": code, "outputs": output_by_digest}, CODEGEN_CACHE_MAX_ENTRIES
         )
 
-        @agent.tool(retries=3)
-        async def evaluate_and_sample_code(
-            ctx: RunContext[None], code: str, iteration_count: int
-        ) -> "CodegenAgent._CodeEvaluationResult":
-            logger.info(
-                f"Tool evaluate_and_sample_code called with iteration_count: {iteration_count}"
+    @staticmethod
+    def _load_cached_outputs(cache_path: Path) -> Optional[List[Dict[str, Any]]]:
+        outputs = (read_cache_entry(cache_path) or {}).get("outputs")
+        return outputs if isinstance(outputs, list) else None
+
+    @staticmethod
+    def _store_cached_outputs(cache_path: Path, outputs: List[Dict[str, Any]]) -> None:
+        write_cache_entry(cache_path, {"outputs": outputs}, CODEGEN_CACHE_MAX_ENTRIES)
+
+    def _quality_feedback(self, outputs: List[Dict[str, Any]]) -> List[str]:
+        """Run the quality validators over successful outputs, in a fixed order."""
+        quality_feedback: List[str] = []
+        if len(outputs) > 1:
+            columns = key_columns(outputs)  # one pivot shared by the per-key validators
+            all_keys = set(columns)
+            quality_feedback.extend(validate_empty_columns(outputs, all_keys, columns))
+            quality_feedback.extend(validate_identical_columns(outputs, all_keys, columns))
+            quality_feedback.extend(validate_text_representation(outputs, self._unique_samples))
+            if len(all_keys) >= 2:  # both only ever compare two different keys
+                quality_feedback.extend(validate_redundant_key_pairs(outputs, all_keys, columns))
+                quality_feedback.extend(validate_cross_key_duplicates(outputs, all_keys))
+            quality_feedback.extend(validate_internal_repetition(outputs, all_keys))
+            quality_feedback.extend(validate_naive_text_match(outputs, self._unique_samples))
+        return quality_feedback
+
+    async def run(self) -> Tuple[str, List[Dict[str, Any]]]:
+        # hashing the samples and the cache file I/O stay off the event loop
+        run_cache_path = await asyncio.to_thread(self._run_cache_path) if self.use_cache else None
+        cached_run = (
+            await asyncio.to_thread(self._load_cached_run, run_cache_path)
+            if run_cache_path
+            else None
+        )
+        if run_cache_path and cached_run is not None:
+            logger.info(f"Reusing cached parser for these samples from {run_cache_path.name}")
+            final_code, final_outputs = cached_run
+        else:
+            final_code, final_outputs = await self._generate()
+            if run_cache_path is not None:
+                await asyncio.to_thread(
+                    self._store_cached_run, run_cache_path, final_code, final_outputs
+                )
+        if len(self._unique_samples) != len(self.html_samples):
+            # map back so outputs line up with the caller's samples, duplicates included
+            output_by_sample = dict(zip(self._unique_samples, final_outputs, strict=True))
+            final_outputs = [output_by_sample[html] for html in self.html_samples]
+
+        # --- Save results if configured ---
+        self._save_parser(final_code)
+        return final_code, final_outputs
+
+    async def _evaluate_and_sample_code(
+        self, code: str, iteration_count: int
+    ) -> "CodegenAgent._CodeEvaluationResult":
+        logger.info(f"Tool evaluate_and_sample_code called with iteration_count: {iteration_count}")
+        if self.status_cb:
+            await self.status_cb(
+                f"Evaluating code (Iteration {iteration_count})...", "thinking", True
             )
-            if self.status_cb:
-                await self.status_cb(
-                    f"Evaluating code (Iteration {iteration_count})...", "thinking", True
+        cleaned_code = clean_agent_code(code)
+        if self._warmup_task is not None:
+            await self._warmup_task  # normally finished long before the first tool call
+
+        # waits on the sample workers (up to CANDIDATE_TIMEOUT_S); keep that off the event loop
+        success, feedback, outputs = await asyncio.to_thread(
+            self._exec_candidate, cleaned_code, self._unique_samples
+        )
+
+        if success:
+            logger.info("Agent code passed validation")
+            self._last_good = (cleaned_code, outputs)
+            # pure-CPU checks over every output; keep them off the event loop (and UI)
+            quality_feedback = await asyncio.to_thread(self._quality_feedback, outputs)
+
+            quality_feedback_str = "\n- ".join(quality_feedback) if quality_feedback else "None"
+            if quality_feedback:
+                feedback = f"Quality issues detected:\n- {quality_feedback_str}"
+            else:
+                feedback = (
+                    "Code executed successfully with no quality issues detected by validation."
                 )
-            cleaned_code = clean_agent_code(code)
-
-            success, feedback, outputs = self._exec_candidate(cleaned_code, self.html_samples)
-
-            if success:
-                logger.info("Agent code passed validation")
-                quality_feedback: List[str] = []
-                if len(outputs) > 1:
-                    all_keys = set().union(*(d.keys() for d in outputs))
-                    quality_feedback.extend(validate_empty_columns(outputs, all_keys))
-                    quality_feedback.extend(validate_identical_columns(outputs, all_keys))
-                    quality_feedback.extend(
-                        validate_text_representation(outputs, self.html_samples)
-                    )
-                    quality_feedback.extend(validate_redundant_key_pairs(outputs, all_keys))
-                    quality_feedback.extend(validate_cross_key_duplicates(outputs, all_keys))
-                    quality_feedback.extend(validate_internal_repetition(outputs, all_keys))
-                    quality_feedback.extend(validate_naive_text_match(outputs, self.html_samples))
-
-                quality_feedback_str = "\n- ".join(quality_feedback) if quality_feedback else "None"
-                if quality_feedback:
-                    feedback = f"Quality issues detected:\n- {quality_feedback_str}"
-                else:
-                    feedback = (
-                        "Code executed successfully with no quality issues detected by validation."
-                    )
 
-                sampled_outputs_with_indices = sample_items(outputs, sample_size=1)
-                sampled_output_str: Optional[str] = None
-                if sampled_outputs_with_indices:
-                    original_index, sample_dict = sampled_outputs_with_indices[0]
-                    paired_sample = {
-                        "html_input": self.html_samples[original_index],
-                        "extracted_data": sample_dict,
-                    }
-                    sampled_output_str = json.dumps(paired_sample, indent=2, ensure_ascii=False)
-
-                if iteration_count == 1:
-                    retry_message = (
-                        "MANDATORY REFINEMENT (Iteration 1 succeeded, but iteration 2 is required):\n"
-                        "Analyze the quality feedback and the sample output provided below.\n"
-                        "Refine your code to address any issues (e.g., missing data, redundancy, exhaustiveness) and call the tool again.\n\n"
-                        f"Quality Feedback:\n{feedback}\n\n"
-                        f"Sample Input/Output Pair:\n{sampled_output_str}"
+            sampled_outputs_with_indices = sample_items(outputs, sample_size=1)
+            sampled_output_str: Optional[str] = None
+            if sampled_outputs_with_indices:
+                original_index, sample_dict = sampled_outputs_with_indices[0]
+                paired_sample = {
+                    # the model reads this every iteration; parse_element runs on the full html
+                    "html_input": compact_html(self._unique_samples[original_index]),
+                    "extracted_data": sample_dict,
+                }
+                # pydantic's Rust serializer: same text as json.dumps(indent=2, ensure_ascii=False)
+                sampled_output_str = pydantic_core.to_json(paired_sample, indent=2).decode()
+
+            # a clean first pass is accepted as-is: the refinement round trip is the slowest step
+            if iteration_count == 1 and quality_feedback:
+                retry_message = (
+                    "MANDATORY REFINEMENT (Iteration 1 ran, but quality issues require iteration 2):\n"
+                    "Analyze the quality feedback and the sample output provided below.\n"
+                    "Refine your code to address any issues (e.g., missing data, redundancy, exhaustiveness) and call the tool again.\n\n"
+                    f"Quality Feedback:\n{feedback}\n\n"
+                    f"Sample Input/Output Pair:\n{sampled_output_str}"
+                )
+                logger.info("Raising ModelRetry: Forcing iteration 2 for quality issues…")
+                if self.status_cb:
+                    await self.status_cb(
+                        "Refining code (Mandatory Iteration 2)...", "thinking", True
                     )
-                    logger.info("Raising ModelRetry: Forcing mandatory iteration 2 due to policy…")
-                    if self.status_cb:
-                        await self.status_cb(
-                            "Refining code (Mandatory Iteration 2)...", "thinking", True
-                        )
-                    raise ModelRetry(retry_message)
-            else:
-                logger.warning(f"Raising ModelRetry: Code validation failed: {feedback}")
-                raise ModelRetry(feedback)
-
-            return CodegenAgent._CodeEvaluationResult(
-                success=success,
-                feedback=feedback,
-                sampled_output_with_html=sampled_output_str,
-                iteration_count=iteration_count,
+                raise ModelRetry(retry_message)
+        else:
+            logger.info("Raising ModelRetry: code validation failed")  # feedback logged above
+            raise ModelRetry(feedback)
+
+        return CodegenAgent._CodeEvaluationResult(
+            success=success,
+            feedback=feedback,
+            sampled_output_with_html=sampled_output_str,
+            iteration_count=iteration_count,
+        )
+
+    async def _generate(self) -> Tuple[str, List[Dict[str, Any]]]:
+        """Run the agent loop; returns the validated code and its outputs per unique sample."""
+        agent = _get_codegen_agent(self.model_cfg.codegen_model)
+        self._last_good = None
+
+        # start the sample workers while the model writes its first candidate
+        self._warmup_task = asyncio.create_task(
+            asyncio.to_thread(
+                _warm_up_sample_workers, min(_SAMPLE_WORKERS, len(self._unique_samples))
             )
+        )
 
         initial_iteration = 1
-        response = await agent.run(
-            f"generate the initial python code and evaluate it using the tool (iteration {initial_iteration})."
-        )
+        try:
+            response = await asyncio.wait_for(
+                agent.run(
+                    f"generate the initial python code and evaluate it using the tool (iteration {initial_iteration}).",
+                    deps=self,
+                    model_settings=self.model_cfg.model_settings,
+                    usage_limits=UsageLimits(request_limit=AGENT_REQUEST_LIMIT),
+                ),
+                timeout=AGENT_RUN_TIMEOUT_S,
+            )
+        except (TimeoutError, UsageLimitExceeded) as e:
+            if self._last_good is None:
+                raise
+            reason = str(e) or f"no final answer within {AGENT_RUN_TIMEOUT_S:g}s"
+            logger.warning(f"Agent stopped early ({reason}); using the last validated candidate.")
+            return self._last_good
         final_code_obj = response.output
         logger.info("Agent run finished.")
         final_code = clean_agent_code(final_code_obj)
-        success, feedback, final_outputs = self._exec_candidate(final_code, self.html_samples)
+        last_good = self._last_good
+        if last_good is not None and last_good[0] == final_code:
+            # the tool already ran and validated exactly this code
+            logger.debug("Final code matches the last validated candidate; reusing its outputs.")
+            success, feedback, final_outputs = True, "success", last_good[1]
+        else:
+            logger.info("Final code differs from the last validated candidate; re-validating.")
+            success, feedback, final_outputs = await asyncio.to_thread(
+                self._exec_candidate, final_code, self._unique_samples
+            )
         if not success:
             logger.error(
                 f"INTERNAL ERROR: Agent returned code that failed final validation: {feedback}"
@@ -241,8 +523,10 @@ class CodegenAgent:
             raise RuntimeError(
                 f"agent returned non-working code despite internal validation: {feedback}"
             )
+        return final_code, final_outputs
 
-        # --- Save results if configured ---
+    def _save_parser(self, final_code: str) -> None:
+        """Write the parser file for base_url when save_results is set."""
         if self.save_results and self.parser_save_dir:
             assert self.base_url is not None  # Ensured by __init__ validation
 
@@ -285,4 +569,30 @@ class CodegenAgent:
                 "Skipped saving: parser save directory was not correctly initialized or created."
             )
 
-        return final_code, final_outputs
+
+# --- Shared pydantic_ai Agent ---
+# The system prompt and tool schema are built once per model; the run-specific state (samples,
+# status callback, last validated candidate) reaches the tool through `deps`.
+
+
+async def _evaluate_and_sample_code(
+    ctx: RunContext[CodegenAgent], code: str, iteration_count: int
+) -> CodegenAgent._CodeEvaluationResult:
+    return await ctx.deps._evaluate_and_sample_code(code, iteration_count)
+
+
+_codegen_agents: dict[str, Agent[CodegenAgent, str]] = {}
+
+
+def _get_codegen_agent(model: str) -> Agent[CodegenAgent, str]:
+    """Returns the cached codegen Agent for `model`, building it on first use."""
+    agent = _codegen_agents.get(model)
+    if agent is None:
+        agent = Agent(
+            model,
+            deps_type=CodegenAgent,
+            tools=[Tool(_evaluate_and_sample_code, name="evaluate_and_sample_code", max_retries=3)],
+            system_prompt=CODEGEN_PROMPT,
+        )
+        _codegen_agents[model] = agent
+    return agent
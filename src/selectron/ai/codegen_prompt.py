@@ -15,7 +15,7 @@ CODEGEN_PROMPT = textwrap.dedent(
                – **CRITICAL**: Ensure all variables are defined before use. Write robust code that anticipates potential missing elements.
             2. never raise inside `parse_element`; fail gracefully.
             3. do NOT perform I/O, prints, or network calls. safe on import.
-            4. import `BeautifulSoup` and `re` exactly once at the top if needed.
+            4. `BeautifulSoup` and `SoupStrainer` are already in scope – do NOT import them (or lxml); parse with `BeautifulSoup(html, "lxml")` (add `parse_only=SoupStrainer(...)` only when large parts of the html are irrelevant). import `re` exactly once at the top if needed.
 
             Start by identifying the values to extract based on the provided HTML examples. Below are some general keys you should always look for.
             However, you should ALWAYS supplement these with additional keys to EXHAUSTIVELY capture all useful information from the elements.
@@ -56,17 +56,17 @@ CODEGEN_PROMPT = textwrap.dedent(
             - The tool will return a `CodeEvaluationResult` object containing `success`, `feedback`, `sampled_output_with_html`, and `iteration_count`.
             - If `success` is false, read the `feedback`, fix your code, and **call the tool again** with the corrected code.
             - If `success` is true:
-                - Examine the `sampled_output_with_html` (a json string of ONE sample `{html_input: ..., extracted_data: ...}`). Compare the `extracted_data` directly against the `html_input`.
+                - Examine the `sampled_output_with_html` (a json string of ONE sample `{html_input: ..., extracted_data: ...}`). Compare the `extracted_data` directly against the `html_input`. (`html_input` is abbreviated to save space: scripts, styles, comments, svg contents and inline `style`/`srcset` attributes are removed, `data:` uris are cut short and whitespace is collapsed. your code still runs on the full html.)
                 - CAREFULLY read the `feedback` field – even if success is true, it may contain important quality notes (e.g., missing data, redundant fields).
-                - **Mandatory Iteration**: You MUST call the tool AGAIN at least once (i.e., perform at least iteration 2) even if the first attempt (`iteration_count: 1`) succeeded. Use this mandatory iteration to refine your code based on the quality feedback and your own analysis of the paired sample.
+                - **Mandatory Iteration**: If the tool reports quality issues, you MUST call the tool AGAIN (i.e., perform at least iteration 2) even if the attempt succeeded. Use this iteration to refine your code based on the quality feedback and your own analysis of the paired sample. If iteration 1 succeeds with no quality issues, you may finish.
                 - Continue iterating using the tool if necessary until the code is robust, correct, and addresses all feedback.
-            - **Refinement**: In each iteration (especially the mandatory second one), focus on:
+            - **Refinement**: In each iteration (especially a mandatory second one), focus on:
                 - Fixing any specific errors or quality issues mentioned in the `feedback`.
                 - Improving extraction based on comparing the `extracted_data` to the `html_input` in the sample.
                 - Ensuring the code adheres to all TASK guidelines (exhaustiveness, robustness, mece).
 
             FINAL RESPONSE FORMAT:
-            - After you have successfully validated the code using the tool (including the mandatory second iteration), your FINAL response MUST be ONLY the raw Python code string itself.
+            - After you have successfully validated the code using the tool (including any mandatory second iteration), your FINAL response MUST be ONLY the raw Python code string itself.
             - **ABSOLUTELY DO NOT** wrap the code in markdown fences (```python ... ```) or JSON structure. Ensure the response body contains *only* the Python code for the `parse_element` function and its necessary imports.
             """
 ).strip()
@@ -1,7 +1,28 @@
-from typing import Any, Dict, List, Set, Tuple
+import ast
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
 from bs4 import BeautifulSoup
 
+# parser code must not do I/O: calls rejected at module level, modules rejected anywhere
+_IO_CALLS = frozenset({"print", "open", "input", "exit", "quit", "breakpoint"})
+_IO_MODULES = (
+    "requests",
+    "httpx",
+    "aiohttp",
+    "urllib.request",
+    "http.client",
+    "socket",
+    "subprocess",
+    "selenium",
+)
+# builds code at runtime, past the static checks
+_DYNAMIC_CODE_CALLS = frozenset({"eval", "exec", "compile", "__import__"})
+
+_FENCE = "```"
+_PYTHON_FENCE = "```python"
+_STR_OR_INT = (str, int)
+
 
 def _flatten(val: Any) -> List[str]:
     """Helper to flatten nested values (lists, dicts) into a list of strings."""
@@ -20,65 +41,104 @@ def _flatten(val: Any) -> List[str]:
     return []
 
 
-def validate_empty_columns(outputs: List[Dict[str, Any]], keys: Set[str]) -> List[str]:
+# key -> {output index: value}, for the outputs that contain the key
+KeyColumns = Dict[str, Dict[int, Any]]
+
+_EMPTY_VALUES = (None, "", [], {})
+
+
+def key_columns(outputs: List[Dict[str, Any]]) -> KeyColumns:
+    """Pivot outputs into per-key columns in one pass, so key validators can share it."""
+    columns: KeyColumns = {}
+    for idx, output_dict in enumerate(outputs):
+        for key, value in output_dict.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = {}
+            column[idx] = value
+    return columns
+
+
+def validate_empty_columns(
+    outputs: List[Dict[str, Any]], keys: Set[str], columns: Optional[KeyColumns] = None
+) -> List[str]:
     """Check for keys that only ever have empty values across all outputs.
     Returns a list of feedback strings for problematic keys.
     """
+    if columns is None:
+        columns = key_columns(outputs)
     feedback: List[str] = []
     for key in keys:
-        is_always_empty = True
-        found_key_at_least_once = False
-        for output_dict in outputs:
-            if key in output_dict:
-                found_key_at_least_once = True
-                value = output_dict[key]
-                # Define "non-empty": not None, not "", not [], not {}
-                if value not in (None, "", [], {}):
-                    is_always_empty = False
-                    break
-        if found_key_at_least_once and is_always_empty:
+        column = columns.get(key)
+        # Define "non-empty": not None, not "", not [], not {}
+        if column and all(value in _EMPTY_VALUES for value in column.values()):
             feedback.append(
                 f"Key '{key}' exists but has only empty values (e.g., '', [], {{}}, None) across all results. Consider removing it or fixing the extraction."
             )
     return feedback
 
 
-def validate_identical_columns(outputs: List[Dict[str, Any]], keys: Set[str]) -> List[str]:
+def validate_identical_columns(
+    outputs: List[Dict[str, Any]], keys: Set[str], columns: Optional[KeyColumns] = None
+) -> List[str]:
     """Check for keys that have the same non-empty value across all outputs where they appear.
 
     Returns a list of feedback strings for problematic keys.
     """
+    if columns is None:
+        columns = key_columns(outputs)
     feedback: List[str] = []
     for key in keys:
-        first_value: Any = None
-        found_key_more_than_once = False
-        is_always_identical = True
-        initial_value_set = False
-        count = 0
-
-        for output_dict in outputs:
-            if key in output_dict:
-                count += 1
-                if not initial_value_set:
-                    first_value = output_dict[key]
-                    initial_value_set = True
-
-        if count > 1:
-            found_key_more_than_once = True
-            for output_dict in outputs:
-                if key in output_dict:
-                    if output_dict[key] != first_value:
-                        is_always_identical = False
-                        break
-
-        if found_key_more_than_once and is_always_identical:
-            if first_value not in (None, "", [], {}):
-                feedback.append(
-                    f"Key '{key}' has the identical non-empty value '{repr(first_value)[:50]}...' across all {count} results where it appears. Is this intended?"
-                )
+        column = columns.get(key)
+        count = len(column) if column else 0
+        if count <= 1:
+            continue
+        values = iter(column.values())
+        first_value = next(values)
+        if first_value in _EMPTY_VALUES:
+            continue
+        if all(value == first_value for value in values):
+            feedback.append(
+                f"Key '{key}' has the identical non-empty value '{repr(first_value)[:50]}...' across all {count} results where it appears. Is this intended?"
+            )
     return feedback
 
 
+@lru_cache(maxsize=128)
+def _sample_visible_text(html: str) -> Optional[str]:
+    """The element's visible text (`get_text(" ", strip=True)`), or None if the html has no tags.
+
+    Cached because the codegen samples are the same on every iteration and both text
+    validators need this text.
+    """
+    try:
+        # Need try-except as bs4 can sometimes fail on fragments
+        soup = BeautifulSoup(html, "html.parser")
+        # Heuristic: If soup seems minimal/fragmentary, treat as parsing failure
+        if not soup.find(True):  # Check if *any* tag was parsed
+            return None
+        return soup.get_text(" ", strip=True)
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=128)
+def _sample_text_tokens(html: str) -> Optional[Tuple[str, FrozenSet[str]]]:
+    """Lowercased visible text and its token set, as compared against every output value."""
+    sample_text = _sample_visible_text(html)
+    if not sample_text:
+        return None
+    plain_text = sample_text.lower()
+    return plain_text, frozenset(plain_text.split())
+
+
+@lru_cache(maxsize=128)
+def _sample_normalized_text(html: str) -> Optional[str]:
+    """Visible text with whitespace runs collapsed, for exact comparison with output values."""
+    sample_text = _sample_visible_text(html)
+    return " ".join(sample_text.split()) if sample_text else None
+
+
 def validate_text_representation(
     outputs: List[Dict[str, Any]], html_samples: List[str]
 ) -> List[str]:
@@ -88,23 +148,11 @@ def validate_text_representation(
     feedback: List[str] = []
     samples_without_text_match: List[int] = []
     for idx, output_dict in enumerate(outputs):
-        parsing_succeeded = False  # Track if text extraction worked
-        plain_text = ""  # Initialize plain_text
-        try:
-            # Need try-except as bs4 can sometimes fail on fragments
-            soup = BeautifulSoup(html_samples[idx], "html.parser")
-            # Heuristic: If soup seems minimal/fragmentary, treat as parsing failure for this validation
-            if not soup.find(True):  # Check if *any* tag was parsed
-                raise ValueError("Parsed soup seems empty or is just text.")
-            plain_text = soup.get_text(" ", strip=True).lower()
-            if not plain_text:  # Also treat empty text result as skippable
-                raise ValueError("Parsed text is empty.")
-            parsing_succeeded = True  # Mark success only if soup and text seem valid
-        except Exception:  # Catch broader exceptions including our ValueError
+        sample_text_tokens = _sample_text_tokens(html_samples[idx])
+        if not sample_text_tokens:
             # If text extraction or sanity check fails, skip validation for this sample
             continue
-
-        plain_tokens = set(plain_text.split())
+        plain_text, plain_tokens = sample_text_tokens
         has_match = False
 
         for val in output_dict.values():
@@ -140,7 +188,7 @@ def validate_text_representation(
             if has_match:
                 break  # Exit outer loop once a match is found for the sample
 
-        if parsing_succeeded and not has_match:
+        if not has_match:
             samples_without_text_match.append(idx)
 
     if samples_without_text_match:
@@ -152,7 +200,9 @@ def validate_text_representation(
     return feedback
 
 
-def validate_redundant_key_pairs(outputs: List[Dict[str, Any]], keys: Set[str]) -> List[str]:
+def validate_redundant_key_pairs(
+    outputs: List[Dict[str, Any]], keys: Set[str], columns: Optional[KeyColumns] = None
+) -> List[str]:
     """Check pairs of keys for consistent redundancy across all outputs.
     Returns a list of feedback strings for problematic key pairs.
     """
@@ -160,28 +210,20 @@ def validate_redundant_key_pairs(outputs: List[Dict[str, Any]], keys: Set[str])
     # No point checking redundancy with 0 or 1 output dicts
     if len(outputs) <= 1:
         return feedback
-
-    checked_pairs: Set[frozenset[str]] = set()
-    for key1 in keys:
-        for key2 in keys:
-            if key1 == key2 or frozenset([key1, key2]) in checked_pairs:
-                continue
-
-            is_redundant = True
-            found_pair = False
-            for output_dict in outputs:
-                if key1 in output_dict and key2 in output_dict:
-                    found_pair = True
-                    # Compare values (handle various types implicitly with !=)
-                    if output_dict[key1] != output_dict[key2]:
-                        is_redundant = False
-                        break
-
-            if found_pair and is_redundant:
+    if columns is None:
+        columns = key_columns(outputs)
+
+    ordered_keys = list(keys)
+    for i, key1 in enumerate(ordered_keys):
+        column1 = columns.get(key1, {})
+        for key2 in ordered_keys[i + 1 :]:  # each unordered pair once
+            column2 = columns.get(key2, {})
+            shared = column1.keys() & column2.keys()  # outputs where both are present
+            # Compare values (handle various types implicitly with ==)
+            if shared and all(column1[idx] == column2[idx] for idx in shared):
                 feedback.append(
                     f"Keys '{key1}' and '{key2}' appear to have identical values across all results where both are present. Consider merging or removing one."
                 )
-            checked_pairs.add(frozenset([key1, key2]))
     return feedback
 
 
@@ -295,16 +337,9 @@ def validate_naive_text_match(outputs: List[Dict[str, Any]], html_samples: List[
     naive_match_keys: Set[str] = set()
 
     for idx, output_dict in enumerate(outputs):
-        try:
-            soup = BeautifulSoup(html_samples[idx], "html.parser")
-            # Ensure soup parsing didn't completely fail
-            if not soup.find(True):
-                continue
-            naive_text = soup.get_text(separator=" ", strip=True)
-            if not naive_text:  # Skip if the element genuinely has no text
-                continue
-        except Exception:
-            continue  # Skip if HTML parsing fails
+        normalized_naive_text = _sample_normalized_text(html_samples[idx])
+        if not normalized_naive_text:  # Skip if parsing failed or the element has no text
+            continue
 
         for key, value in output_dict.items():
             if key in naive_match_keys:
@@ -313,8 +348,7 @@ def validate_naive_text_match(outputs: List[Dict[str, Any]], html_samples: List[
             # Only check string values
             if isinstance(value, str):
                 # Normalize whitespace before exact match
-                normalized_value = " ".join(value.strip().split())
-                normalized_naive_text = " ".join(naive_text.split())
+                normalized_value = " ".join(value.split())
                 # Compare based on word sequence, ignoring inter-word spacing differences
                 if normalized_value and normalized_value == normalized_naive_text:
                     naive_match_keys.add(key)
@@ -362,18 +396,86 @@ def clean_agent_code(agent_output: Any) -> str:
         # Assume it's already a string or convertible
         code_str = str(agent_output)
 
-    # Strip markdown fences
     if code_str is None:  # Should not happen with current logic, but safety check
         code_str = ""
-    cleaned_code = code_str.strip()
-    if cleaned_code.startswith("```python"):
-        cleaned_code = cleaned_code[len("```python") :].strip()
-    elif cleaned_code.startswith("```"):
-        cleaned_code = cleaned_code[len("```") :].strip()
-    if cleaned_code.endswith("```"):
-        cleaned_code = cleaned_code[: -len("```")].strip()
+    return _strip_fences(code_str)
+
 
-    return cleaned_code
+def validate_parser_code_shape(tree: ast.Module) -> Optional[str]:
+    """Static checks on parsed candidate code, run before anything is executed.
+
+    Returns feedback for the first problem found, or None if the code looks runnable.
+    """
+    parse_fn: Optional[ast.FunctionDef] = None
+    for stmt in tree.body:
+        if isinstance(stmt, ast.FunctionDef) and stmt.name == "parse_element":
+            parse_fn = stmt
+        elif not isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            # module-level code runs on import
+            for node in ast.walk(stmt):
+                if (
+                    isinstance(node, ast.Call)
+                    and isinstance(node.func, ast.Name)
+                    and node.func.id in _IO_CALLS
+                ):
+                    return f"module-level call to `{node.func.id}()` (line {node.lineno}); code must be safe on import"
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id in _DYNAMIC_CODE_CALLS
+        ):
+            return f"call to `{node.func.id}()` (line {node.lineno}); parser code must not build code at runtime"
+        if isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules = [node.module]
+        else:
+            continue
+        for module in modules:
+            if any(module == io or module.startswith(io + ".") for io in _IO_MODULES):
+                return f"import of `{module}` (line {node.lineno}); parser code must not do network or process I/O"
+    if parse_fn is None:
+        # also accept bindings other than a top-level def (conditional def, assignment, ...)
+        binds_parse_element = any(
+            (isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store))
+            if getattr(node, "id", None) == "parse_element"
+            else isinstance(node, ast.FunctionDef) and node.name == "parse_element"
+            for node in ast.walk(tree)
+        )
+        if not binds_parse_element:
+            return "function `parse_element(html: str) -> dict` not found"
+        return None
+    args = parse_fn.args
+    positional = len(args.posonlyargs) + len(args.args)
+    required = positional - len(args.defaults)
+    if not (required <= 1 and (positional >= 1 or args.vararg)):
+        return "`parse_element` must take the html string as its only required argument"
+    return None
+
+
+def _strip_fences(code: str) -> str:
+    """Strip surrounding whitespace and a ```python / ``` markdown fence (either side may be missing)."""
+    code = code.strip()
+    # startswith/endswith are constant-time; a DOTALL regex would scan the whole body
+    if code.startswith(_FENCE):
+        opening = _PYTHON_FENCE if code.startswith(_PYTHON_FENCE) else _FENCE
+        code = code[len(opening) :].lstrip()
+    if code.endswith(_FENCE):
+        code = code[: -len(_FENCE)].rstrip()
+    return code
+
+
+def _is_valid_list_item(item: Any) -> bool:
+    """True for a str or a dict[str, str | int | None] list element."""
+    if isinstance(item, str):
+        return True
+    if not isinstance(item, dict):
+        return False
+    for k, v in item.items():
+        if v is not None and not (isinstance(k, str) and isinstance(v, _STR_OR_INT)):
+            return False
+    return True
 
 
 def validate_result(obj: Any) -> Tuple[bool, str]:
@@ -382,32 +484,12 @@ def validate_result(obj: Any) -> Tuple[bool, str]:
     Allowed value types:
     - str
     - int
-    - list[Any] (recursively validated so elements are allowed types)
+    - list[str | dict[str, str | int | None]]
     - dict[str, str]
-    """
-
-    def _is_valid_val(val: Any) -> bool:
-        if isinstance(val, str):
-            return True
-        if isinstance(val, int):
-            return True
-        if isinstance(val, dict):
-            # Check for dict[str, str]
-            return all(isinstance(k, str) and isinstance(v, str) for k, v in val.items())
-        if isinstance(val, list):
-            # Explicitly check for list[str | dict[str, str | int | None]]
-            for item in val:
-                is_item_str = isinstance(item, str)
-                # Check if item is a dict where keys are str and values are str, int, or None
-                is_item_dict_flexible_values = isinstance(item, dict) and all(
-                    isinstance(k, str) and isinstance(v_inner, (str, int)) or v_inner is None
-                    for k, v_inner in item.items()
-                )
-                if not (is_item_str or is_item_dict_flexible_values):
-                    return False  # Item is neither str nor dict[str, str | int | None]
-            return True  # All items were valid str or dict[str, str | int | None]
-        return False
 
+    Runs for every sample on every codegen iteration, so each value is checked in a single
+    pass (no second scan to build the error message) with exact-type fast paths for scalars.
+    """
     if not isinstance(obj, dict):
         return False, "result is not a dict"
     if not obj:
@@ -415,34 +497,26 @@ def validate_result(obj: Any) -> Tuple[bool, str]:
     for k, v in obj.items():
         if not isinstance(k, str):
             return False, f"non-string key detected: {k!r}"
-        if not _is_valid_val(v):
-            # If validation fails and the value is a list, find the invalid item
-            if isinstance(v, list):
-                for idx, item in enumerate(v):
-                    is_item_str = isinstance(item, str)
-                    # Check if item is a dict where keys are str and values are str, int, or None
-                    is_item_dict_flexible_values = isinstance(item, dict) and all(
-                        isinstance(k, str) and isinstance(v_inner, (str, int)) or v_inner is None
-                        for k, v_inner in item.items()
-                    )
-                    if not (is_item_str or is_item_dict_flexible_values):
-                        # Construct specific feedback for list item failure
-                        return (
-                            False,
-                            f"invalid item at index {idx} for key '{k}'. Expected str or dict[str, str | int | None], but got {type(item)} with invalid internal types.",
-                        )
-                # Should not be reached if _is_valid_val returned False, but as a fallback:
-                return (
-                    False,
-                    f"invalid list value for key '{k}' (reason unclear, check list items).",
-                )
-            else:
-                # Generic feedback for non-list types
-                if v is None:
+        value_type = type(v)
+        if value_type is str or value_type is int or isinstance(v, _STR_OR_INT):
+            continue
+        if isinstance(v, dict):
+            for dict_k, dict_v in v.items():
+                if not (isinstance(dict_k, str) and isinstance(dict_v, str)):
+                    return False, f"invalid value for key '{k}': type {value_type}"
+            continue
+        if isinstance(v, list):
+            for idx, item in enumerate(v):
+                if not _is_valid_list_item(item):
                     return (
                         False,
-                        f"invalid value for key '{k}': assigned None. Omit the key entirely if no valid value is found.",
+                        f"invalid item at index {idx} for key '{k}'. Expected str or dict[str, str | int | None], but got {type(item)} with invalid internal types.",
                     )
-                else:
-                    return False, f"invalid value for key '{k}': type {type(v)}"
+            continue
+        if v is None:
+            return (
+                False,
+                f"invalid value for key '{k}': assigned None. Omit the key entirely if no valid value is found.",
+            )
+        return False, f"invalid value for key '{k}': type {value_type}"
     return True, "ok"
@@ -1,12 +1,16 @@
 import asyncio
+import hashlib
 import io
+from pathlib import Path
 from typing import Optional
 
 from PIL import Image
-from pydantic import BaseModel, Field
-from pydantic_ai import Agent, BinaryContent
+from pydantic import BaseModel, Field, ValidationError
+from pydantic_ai import Agent, BinaryContent, ModelRetry
 from pydantic_ai.exceptions import ModelHTTPError
 
+from selectron.util.get_app_dir import get_cache_dir
+from selectron.util.json_cache import read_cache_entry, write_cache_entry
 from selectron.util.logger import get_logger
 from selectron.util.model_config import ModelConfig
 from selectron.util.time_execution import time_execution_async
@@ -15,6 +19,14 @@ from .types import AutoProposal
 
 logger = get_logger(__name__)
 
+# Proposals per (model, prompt, screenshot bytes): an unchanged page skips the vision call
+PROPOSAL_CACHE_DIR_NAME = "proposals"
+PROPOSAL_CACHE_MAX_ENTRIES = 256
+# Vision models downscale anything larger server-side; sending less cuts upload and latency
+PROPOSAL_IMAGE_MAX_SIDE = 2048
+# Malformed or empty answers are sent back to the model with the error this many times
+PROPOSAL_OUTPUT_RETRIES = 2
+
 PROPOSAL_PROMPT = """You are an expert UI analyst. Analyze the provided screenshot.
 
 1.  **Identify the Main Content Area:** Locate the region(s) displaying the core content, ignoring global elements like headers, footers, navigation, and sidebars. Focus on information-rich primary content suitable for extracting important structured data from the page. Categorize the page into one of two types:
@@ -33,18 +45,65 @@ class _ProposalResponse(BaseModel):
     description: str = Field(..., description="The proposed description for the main content area")
 
 
+def _require_description(output: _ProposalResponse) -> _ProposalResponse:
+    if not output.description.strip():
+        raise ModelRetry('"description" is empty; describe the main content region.')
+    return output
+
+
+def _encode_jpeg(screenshot: Image.Image) -> bytes:
+    buffered = io.BytesIO()
+    img_to_save = screenshot
+    if img_to_save.mode == "RGBA":
+        img_to_save = img_to_save.convert("RGB")
+    if max(img_to_save.size) > PROPOSAL_IMAGE_MAX_SIDE:
+        if img_to_save is screenshot:
+            img_to_save = img_to_save.copy()  # thumbnail() resizes in place
+        img_to_save.thumbnail((PROPOSAL_IMAGE_MAX_SIDE, PROPOSAL_IMAGE_MAX_SIDE), Image.LANCZOS)
+    img_to_save.save(buffered, format="JPEG", quality=85, optimize=True)
+    return buffered.getvalue()
+
+
+def _proposal_cache_path(model: str, image_bytes: bytes) -> Path:
+    key = hashlib.sha256()
+    for field in (model.encode(), PROPOSAL_PROMPT.encode(), image_bytes):
+        # length prefixes keep field boundaries unambiguous
+        key.update(len(field).to_bytes(8, "little"))
+        key.update(field)
+    return get_cache_dir() / PROPOSAL_CACHE_DIR_NAME / f"{key.hexdigest()}.json"
+
+
+def _load_cached_proposal(cache_path: Path) -> Optional[AutoProposal]:
+    entry = read_cache_entry(cache_path)
+    if entry is None:
+        return None
+    try:
+        return AutoProposal.model_validate(entry)
+    except ValidationError as e:
+        logger.debug(f"Ignoring invalid proposal cache entry {cache_path}: {e}")
+        return None
+
+
+def _store_cached_proposal(cache_path: Path, proposal: AutoProposal) -> None:
+    write_cache_entry(cache_path, proposal.model_dump(), PROPOSAL_CACHE_MAX_ENTRIES)
+
+
 @time_execution_async("propose_selection")
 async def propose_selection(
     screenshot: Image.Image,
     model_config: ModelConfig,
 ) -> Optional[AutoProposal]:
     try:
-        buffered = io.BytesIO()
-        img_to_save = screenshot
-        if img_to_save.mode == "RGBA":
-            img_to_save = img_to_save.convert("RGB")
-        img_to_save.save(buffered, format="JPEG", quality=85)
-        image_bytes = buffered.getvalue()
+        # encoding a full-page screenshot takes tens of ms; keep it off the ui event loop
+        image_bytes = await asyncio.to_thread(_encode_jpeg, screenshot)
+        # cache lookups hit the disk; off the event loop as well
+        cache_path = await asyncio.to_thread(
+            _proposal_cache_path, model_config.analyze_model, image_bytes
+        )
+        cached_proposal = await asyncio.to_thread(_load_cached_proposal, cache_path)
+        if cached_proposal is not None:
+            logger.debug(f"Reusing cached proposal from {cache_path.name}")
+            return cached_proposal
         agent_input = [
             PROPOSAL_PROMPT,
             BinaryContent(data=image_bytes, media_type="image/jpeg"),
@@ -52,12 +111,16 @@ async def propose_selection(
         agent = Agent[None, _ProposalResponse](
             model=model_config.analyze_model,
             output_type=_ProposalResponse,
+            retries=PROPOSAL_OUTPUT_RETRIES,  # no tools, so this only covers the output
         )
+        agent.output_validator(_require_description)
         result = await agent.run(agent_input)
         await asyncio.sleep(0)  # Yield control briefly
         proposal_response = result.output
         if proposal_response and proposal_response.description:
-            return AutoProposal(proposed_description=proposal_response.description.strip())
+            proposal = AutoProposal(proposed_description=proposal_response.description.strip())
+            await asyncio.to_thread(_store_cached_proposal, cache_path, proposal)
+            return proposal
         else:
             logger.warning("PydanticAI returned a valid structure but with an empty description.")
             return None
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import traceback
-from typing import Any, Callable, Coroutine, Optional, Protocol
+from typing import Any, Callable, Coroutine, Optional, Protocol, TypeVar
 
-from pydantic_ai import Agent, Tool
+from pydantic_ai import Agent, RunContext, Tool
 from pydantic_ai.exceptions import AgentRunError
 
 from selectron.ai.selector_prompt import (
     SELECTOR_PROMPT_BASE,
     SELECTOR_PROMPT_DOM_TEMPLATE,
+    SELECTOR_QUERY_TEMPLATE,
 )
 from selectron.ai.selector_tools import SelectorTools
 from selectron.ai.types import (
@@ -20,6 +22,17 @@ from selectron.util.model_config import ModelConfig
 
 logger = get_logger(__name__)
 
+_ToolResultT = TypeVar("_ToolResultT")
+
+# Highlight requests waiting for the per-run consumer; beyond this, new highlights are dropped
+HIGHLIGHT_QUEUE_SIZE = 16
+# Max time a finished run waits for queued highlights before the caller's final highlight
+HIGHLIGHT_DRAIN_TIMEOUT_SECONDS = 5.0
+# A proposal that fails schema validation is sent back with the error this many times
+SELECTOR_OUTPUT_RETRIES = 2
+# Tools keep pydantic_ai's default of one retry; the agent-wide retries above are for the output
+SELECTOR_TOOL_RETRIES = 1
+
 
 # Type alias for the async status callback
 StatusCallback = Callable[[str, str, bool], Coroutine[Any, Any, None]]
@@ -70,6 +83,7 @@ class SelectorAgent:
         status_cb: Optional[StatusCallback] = None,
         highlighter: Optional[Highlighter] = None,
         debug_dump: bool = False,
+        tools: Optional[SelectorTools] = None,
     ):
         self.html_content = html_content
         self.dom_string = dom_string
@@ -79,9 +93,17 @@ class SelectorAgent:
         self.highlighter = highlighter
         self.debug_dump = debug_dump
 
-        self._tools_instance = SelectorTools(html_content=self.html_content, base_url=self.base_url)
+        # Reuse a caller-provided SelectorTools (already-parsed soup) when available
+        self._tools_instance = tools or SelectorTools(
+            html_content=self.html_content, base_url=self.base_url
+        )
         self._tool_call_count = 0
         self._best_selector_so_far: Optional[str] = None  # Track the last valid selector found
+        # Tool highlights are drawn in order by a background consumer so tools never wait on CDP
+        self._highlight_queue: asyncio.Queue[tuple[str, str, asyncio.Future[bool]]] = asyncio.Queue(
+            maxsize=HIGHLIGHT_QUEUE_SIZE
+        )
+        self._highlight_consumer: Optional[asyncio.Task[None]] = None
 
     async def _safe_status_update(self, message: str, state: str, show_spinner: bool) -> None:
         if self.status_cb:
@@ -99,16 +121,84 @@ class SelectorAgent:
                 return False
         return False  # Indicate no highlight attempted/successful
 
+    async def _consume_highlights(self) -> None:
+        """Draws queued highlights one at a time, skipping requests cancelled by a failed tool."""
+        while True:
+            selector, color, request = await self._highlight_queue.get()
+            try:
+                if not request.cancelled():
+                    request.set_result(await self._safe_highlight(selector, color))
+            finally:
+                self._highlight_queue.task_done()
+
+    def _enqueue_highlight(self, selector: str, color: str) -> Optional[asyncio.Future[bool]]:
+        if self._highlight_consumer is None or self._highlight_consumer.done():
+            self._highlight_consumer = asyncio.create_task(self._consume_highlights())
+        request: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        try:
+            self._highlight_queue.put_nowait((selector, color, request))
+        except asyncio.QueueFull:
+            logger.debug("Highlight queue full, dropping highlight for '%s'", selector[:30])
+            return None
+        return request
+
+    async def _drain_highlights(self) -> None:
+        """Lets queued highlights finish so they cannot land after the caller's final one."""
+        if self._highlight_consumer is None:
+            return
+        try:
+            await asyncio.wait_for(
+                self._highlight_queue.join(), timeout=HIGHLIGHT_DRAIN_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Timed out waiting for queued highlights to finish.")
+
+    def _stop_highlights(self) -> None:
+        if self._highlight_consumer:
+            self._highlight_consumer.cancel()
+            self._highlight_consumer = None
+        while not self._highlight_queue.empty():
+            self._highlight_queue.get_nowait()[2].cancel()
+            self._highlight_queue.task_done()
+
+    async def _call_tool_with_highlight(
+        self,
+        tool_fn: Callable[..., Coroutine[Any, Any, _ToolResultT]],
+        selector: str,
+        color: str,
+        sending_status: Optional[str] = None,
+        **tool_kwargs: Any,
+    ) -> _ToolResultT:
+        """Runs a tool while its "sending" status is in flight and its highlight is queued.
+
+        The highlight is queued before the tool call and withdrawn if the tool reports an error.
+        The result is returned without waiting for the highlight, which is then drawn while the
+        model works on its next turn.
+        """
+        status_task: Optional[asyncio.Task[None]] = None
+        if sending_status:
+            status_task = asyncio.create_task(
+                self._safe_status_update(sending_status, state="sending", show_spinner=True)
+            )
+        highlight_request = self._enqueue_highlight(selector, color) if self.highlighter else None
+        try:
+            result = await tool_fn(selector=selector, **tool_kwargs)
+        except BaseException:
+            if highlight_request:
+                highlight_request.cancel()
+            raise
+        finally:
+            if status_task:
+                await status_task  # "sending" must land before the caller's result status
+        if highlight_request and (result is None or getattr(result, "error", None)):
+            highlight_request.cancel()
+        return result
+
     # --- Tool Wrapper Methods ---
 
     async def _evaluate_selector_wrapper(self, selector: str, target_text_to_check: str, **kwargs):
         self._tool_call_count += 1
         status_prefix = f"Tool #{self._tool_call_count} |"
-        await self._safe_status_update(
-            f"{status_prefix} evaluate_selector('{selector[:30]}...')",
-            state="sending",
-            show_spinner=True,
-        )
 
         known_args_for_tool = {
             "anchor_selector": kwargs.get("anchor_selector"),
@@ -118,14 +208,16 @@ class SelectorAgent:
         }
         filtered_args_for_tool = {k: v for k, v in known_args_for_tool.items() if v is not None}
 
-        result = await self._tools_instance.evaluate_selector(
-            selector=selector,
+        result = await self._call_tool_with_highlight(
+            self._tools_instance.evaluate_selector,
+            selector,
+            "yellow",
+            sending_status=f"{status_prefix} evaluate_selector('{selector[:30]}...')",
             target_text_to_check=target_text_to_check,
             **filtered_args_for_tool,
         )
 
         if result and result.element_count > 0 and not result.error:
-            await self._safe_highlight(selector, color="yellow")
             await self._safe_status_update(
                 f"{status_prefix} evaluate_selector OK ({result.element_count} found)",
                 state="received_success",
@@ -138,8 +230,6 @@ class SelectorAgent:
                 state="received_no_results",
                 show_spinner=True,
             )
-            # Still try to highlight (might clear previous)
-            await self._safe_highlight(selector, color="yellow")
         elif result and result.error:
             await self._safe_status_update(
                 f"{status_prefix} evaluate_selector Error: {result.error[:50]}...",
@@ -159,22 +249,20 @@ class SelectorAgent:
     async def _get_children_tags_wrapper(self, selector: str, **kwargs):
         self._tool_call_count += 1
         status_prefix = f"[Tool #{self._tool_call_count}]"
-        await self._safe_status_update(
-            f"{status_prefix} get_children_tags('{selector[:30]}...')",
-            state="sending",
-            show_spinner=True,
-        )
         known_args_for_tool = {
             "anchor_selector": kwargs.get("anchor_selector"),
         }
         filtered_args_for_tool = {k: v for k, v in known_args_for_tool.items() if v is not None}
 
-        result = await self._tools_instance.get_children_tags(
-            selector=selector, **filtered_args_for_tool
+        result = await self._call_tool_with_highlight(
+            self._tools_instance.get_children_tags,
+            selector,
+            "red",
+            sending_status=f"{status_prefix} get_children_tags('{selector[:30]}...')",
+            **filtered_args_for_tool,
         )
 
         if result and result.parent_found and not result.error:
-            await self._safe_highlight(selector, color="red")
             await self._safe_status_update(
                 f"{status_prefix} get_children_tags OK ({len(result.children_details or [])} children)",
                 state="received_success",
@@ -186,7 +274,6 @@ class SelectorAgent:
                 state="received_no_results",
                 show_spinner=True,
             )
-            await self._safe_highlight(selector, color="red")  # Highlight parent even if not found?
         elif result and result.error:
             await self._safe_status_update(
                 f"{status_prefix} get_children_tags Error: {result.error[:50]}...",
@@ -205,21 +292,19 @@ class SelectorAgent:
     async def _get_siblings_wrapper(self, selector: str, **kwargs):
         self._tool_call_count += 1
         status_prefix = f"[Tool #{self._tool_call_count}]"
-        await self._safe_status_update(
-            f"{status_prefix} get_siblings('{selector[:30]}...')",
-            state="sending",
-            show_spinner=True,
-        )
         known_args_for_tool = {
             "anchor_selector": kwargs.get("anchor_selector"),
         }
         filtered_args_for_tool = {k: v for k, v in known_args_for_tool.items() if v is not None}
-        result = await self._tools_instance.get_siblings(
-            selector=selector, **filtered_args_for_tool
+        result = await self._call_tool_with_highlight(
+            self._tools_instance.get_siblings,
+            selector,
+            "blue",
+            sending_status=f"{status_prefix} get_siblings('{selector[:30]}...')",
+            **filtered_args_for_tool,
         )
 
         if result and result.element_found and not result.error:
-            await self._safe_highlight(selector, color="blue")
             await self._safe_status_update(
                 f"{status_prefix} get_siblings OK ({len(result.siblings or [])} siblings)",
                 state="received_success",
@@ -231,9 +316,6 @@ class SelectorAgent:
                 state="received_no_results",
                 show_spinner=True,
             )
-            await self._safe_highlight(
-                selector, color="blue"
-            )  # Highlight element even if not found?
         elif result and result.error:
             await self._safe_status_update(
                 f"{status_prefix} get_siblings Error: {result.error[:50]}...",
@@ -329,47 +411,26 @@ class SelectorAgent:
             raise SelectorAgentError("Missing base URL")
 
         try:
-            wrapped_tools = [
-                Tool(self._evaluate_selector_wrapper),
-                Tool(self._get_children_tags_wrapper),
-                Tool(self._get_siblings_wrapper),
-                Tool(self._extract_data_from_element_wrapper),
-            ]
-
-            system_prompt = SELECTOR_PROMPT_BASE
-            if self.dom_string:
-                system_prompt += SELECTOR_PROMPT_DOM_TEMPLATE.format(
-                    dom_representation=self.dom_string
-                )
-            else:
+            if not self.dom_string:
                 logger.warning("Proceeding without DOM string representation.")
 
             await self._safe_status_update("Thinking...", state="thinking", show_spinner=True)
 
-            agent = Agent(
-                self.model_cfg.selector_model,
-                output_type=SelectorProposal,
-                tools=wrapped_tools,
-                system_prompt=system_prompt,
-            )
+            agent = _get_selector_agent(self.model_cfg.selector_model)
 
-            query_parts = [
-                f"Generate the most STABLE CSS selector to target '{selector_description}'.",
-                "Prioritize stable attributes and classes.",
-                "CRITICAL: Your FINAL output MUST be a single JSON object conforming EXACTLY to the SelectorProposal schema. "
-                "This JSON object MUST include values for the fields: 'proposed_selector' (string), 'reasoning' (string), and 'target_cardinality' ('unique' or 'multiple'). "
-                "DO NOT include other fields like 'final_verification' or 'extraction_result' in the final JSON output.",
-            ]
-            query = " ".join(query_parts)
+            query = SELECTOR_QUERY_TEMPLATE.format(selector_description=selector_description)
             agent_input: Any = query
 
-            agent_run_result = await agent.run(agent_input)
+            agent_run_result = await agent.run(
+                agent_input, deps=self, model_settings=self.model_cfg.model_settings
+            )
 
             if isinstance(agent_run_result.output, SelectorProposal):
                 proposal = agent_run_result.output
                 logger.info(
                     f"Agent finished. Proposal: {proposal.proposed_selector} (Cardinality: {proposal.target_cardinality})\nREASONING: {proposal.reasoning}"
                 )
+                await self._drain_highlights()
                 # Final success status update is handled by the caller
                 # Final highlight is handled by the caller
                 # Optional debug dump
@@ -382,7 +443,7 @@ class SelectorAgent:
                             url=self.base_url,
                             reasoning=proposal.reasoning,
                         )
-                    except Exception as dump_err:
+                    except OSError as dump_err:
                         logger.error(f"Failed to save debug elements: {dump_err}", exc_info=True)
 
                 return proposal
@@ -419,3 +480,61 @@ class SelectorAgent:
             tb_str = traceback.format_exc()
             logger.debug(f"Traceback: {tb_str}")
             raise SelectorAgentError(f"Unexpected agent error: {e}") from e
+        finally:
+            self._stop_highlights()
+
+
+# --- Shared pydantic_ai Agent ---
+# Tool schemas and the SelectorProposal output schema are built once per model; everything
+# run-specific (tools instance, highlighter, DOM string) reaches the agent through `deps`.
+
+
+async def _evaluate_selector_wrapper(
+    ctx: RunContext[SelectorAgent], selector: str, target_text_to_check: str, **kwargs
+):
+    return await ctx.deps._evaluate_selector_wrapper(selector, target_text_to_check, **kwargs)
+
+
+async def _get_children_tags_wrapper(ctx: RunContext[SelectorAgent], selector: str, **kwargs):
+    return await ctx.deps._get_children_tags_wrapper(selector, **kwargs)
+
+
+async def _get_siblings_wrapper(ctx: RunContext[SelectorAgent], selector: str, **kwargs):
+    return await ctx.deps._get_siblings_wrapper(selector, **kwargs)
+
+
+async def _extract_data_from_element_wrapper(
+    ctx: RunContext[SelectorAgent], selector: str, **kwargs
+):
+    return await ctx.deps._extract_data_from_element_wrapper(selector, **kwargs)
+
+
+def _dom_system_prompt(ctx: RunContext[SelectorAgent]) -> str:
+    if not ctx.deps.dom_string:
+        return ""
+    return SELECTOR_PROMPT_DOM_TEMPLATE.format(dom_representation=ctx.deps.dom_string)
+
+
+_selector_agents: dict[str, Agent[SelectorAgent, SelectorProposal]] = {}
+
+
+def _get_selector_agent(model: str) -> Agent[SelectorAgent, SelectorProposal]:
+    """Returns the cached selector Agent for `model`, building it on first use."""
+    agent = _selector_agents.get(model)
+    if agent is None:
+        agent = Agent(
+            model,
+            output_type=SelectorProposal,
+            deps_type=SelectorAgent,
+            retries=SELECTOR_OUTPUT_RETRIES,
+            tools=[
+                Tool(_evaluate_selector_wrapper, max_retries=SELECTOR_TOOL_RETRIES),
+                Tool(_get_children_tags_wrapper, max_retries=SELECTOR_TOOL_RETRIES),
+                Tool(_get_siblings_wrapper, max_retries=SELECTOR_TOOL_RETRIES),
+                Tool(_extract_data_from_element_wrapper, max_retries=SELECTOR_TOOL_RETRIES),
+            ],
+            system_prompt=SELECTOR_PROMPT_BASE,
+        )
+        agent.system_prompt(_dom_system_prompt)
+        _selector_agents[model] = agent
+    return agent
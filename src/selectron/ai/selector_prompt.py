@@ -58,3 +58,11 @@ A simplified text representation of the DOM structure is provided below. It uses
 {dom_representation}
 --- SIMPLIFIED DOM END ---
 """
+
+SELECTOR_QUERY_TEMPLATE = (
+    "Generate the most STABLE CSS selector to target '{selector_description}'. "
+    "Prioritize stable attributes and classes. "
+    "CRITICAL: Your FINAL output MUST be a single JSON object conforming EXACTLY to the SelectorProposal schema. "
+    "This JSON object MUST include values for the fields: 'proposed_selector' (string), 'reasoning' (string), and 'target_cardinality' ('unique' or 'multiple'). "
+    "DO NOT include other fields like 'final_verification' or 'extraction_result' in the final JSON output."
+)
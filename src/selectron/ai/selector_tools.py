@@ -1,10 +1,16 @@
+import asyncio
 import copy
+import html as html_lib
+import logging
+import re
 import traceback
+from collections import OrderedDict
 from typing import Optional
 from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup, Tag
-from markdownify import markdownify
+from markdownify import MarkdownConverter
+from soupsieve import SelectorSyntaxError
 
 from selectron.ai.types import (
     ChildDetail,
@@ -25,6 +31,92 @@ DEFAULT_MAX_CHILDREN_TO_DETAIL = 10  # Limit number of detailed children by defa
 DEFAULT_MAX_SNIPPET_LENGTH = 300  # Max length for HTML/Markdown snippets
 DEFAULT_MAX_HTML_LENGTH_VALIDATION = 5000  # Max length for single element HTML validation
 
+# Errors soupsieve raises for invalid/unsupported selectors (e.g. pseudo-elements)
+SELECTOR_ERRORS = (SelectorSyntaxError, NotImplementedError)
+
+
+# Fast path for leaf snippets like <span>text</span> or <a href="...">text</a>
+_SIMPLE_HTML_MAX_LENGTH = 512
+_SIMPLE_HTML_RE = re.compile(r"^<(\w+)((?:\s[^<>]*)?)>([^<\t\r\n]*)</\1>$")
+_HREF_ONLY_RE = re.compile(r'^\s+href="([^"<>]+)"\s*$')
+_UNSAFE_ENTITY_RE = re.compile(r"&(?!(?:amp|lt|gt|quot|#39);)")
+_WHITESPACE_RE = re.compile(r"[ ]+")
+_SIMPLE_INLINE_TAGS = frozenset({"span", "label", "time", "small", "abbr"})
+_SIMPLE_BLOCK_TAGS = frozenset({"div", "p", "section", "article"})
+
+
+def _escape_markdown(text: str) -> str:
+    return text.replace("*", r"\*").replace("_", r"\_")
+
+
+def _simple_html_to_markdown(html: str) -> Optional[str]:
+    """Regex conversion for single-tag, text-only snippets; None if markdownify is needed.
+
+    Output matches markdownify (default escaping) for every snippet accepted here.
+    """
+    if len(html) > _SIMPLE_HTML_MAX_LENGTH:
+        return None
+    match = _SIMPLE_HTML_RE.match(html)
+    if not match:
+        return None
+    tag, attrs, text = match.group(1).lower(), match.group(2), match.group(3)
+    if "&" in text and _UNSAFE_ENTITY_RE.search(text):
+        return None
+    text = _WHITESPACE_RE.sub(" ", html_lib.unescape(text))
+    if "\xa0" in text:
+        return None
+    if tag in _SIMPLE_INLINE_TAGS:
+        return _escape_markdown(text)
+    if tag in _SIMPLE_BLOCK_TAGS:
+        return _escape_markdown(text).strip(" ")
+    if tag != "a":
+        return None
+    href_match = _HREF_ONLY_RE.match(attrs)
+    if not href_match:
+        return None
+    href = html_lib.unescape(href_match.group(1))
+    link_text = text.strip(" ")
+    if not link_text:
+        return ""
+    escaped_text = _escape_markdown(link_text)
+    # markdownify autolinks on the escaped text (only "\_" unescaped), so "a*b" stays a [link],
+    # and drops the text's outer whitespace for an autolink
+    if escaped_text.replace(r"\_", "_") == href:
+        return f"<{href}>"
+    link = f"[{escaped_text}]({href})"
+    # markdownify moves the link text's outer whitespace outside the link
+    return (" " if text.startswith(" ") else "") + link + (" " if text.endswith(" ") else "")
+
+
+# markdown per (element HTML, options); the agent re-evaluates the same elements often
+_MARKDOWN_CACHE_SIZE = 256
+_markdown_cache: "OrderedDict[tuple[str, tuple[tuple[str, str], ...]], str]" = OrderedDict()
+
+
+def _element_to_markdown(element: Tag, **options: str) -> str:
+    """markdownify(str(element)) without re-parsing: converts a detached copy of the parsed tag."""
+    document = BeautifulSoup("", "html.parser")
+    document.append(copy.copy(element))  # own document, so no context leaks from the page
+    return MarkdownConverter(**options).convert_soup(document)
+
+
+async def _html_to_markdown(element: Tag, **options: str) -> str:
+    """Convert an element to markdown: regex fast path, else cached conversion in a worker thread."""
+    html = str(element)
+    simple_md = _simple_html_to_markdown(html)
+    if simple_md is not None:
+        return simple_md
+    key = (html, tuple(sorted(options.items())))
+    md = _markdown_cache.get(key)
+    if md is not None:
+        _markdown_cache.move_to_end(key)
+        return md
+    md = await asyncio.to_thread(_element_to_markdown, element, **options)
+    _markdown_cache[key] = md
+    if len(_markdown_cache) > _MARKDOWN_CACHE_SIZE:
+        _markdown_cache.popitem(last=False)
+    return md
+
 
 class SelectorTools:
     """Internal class holding the BeautifulSoup instance and tool methods."""
@@ -33,24 +125,16 @@ class SelectorTools:
         self.soup = BeautifulSoup(html_content, "html.parser")
         self.base_url = base_url
 
-    def _convert_html_to_markdown(self, element: Tag) -> str:
+    async def _convert_html_to_markdown(self, element: Tag) -> str:
         """Converts a BeautifulSoup Tag element to a Markdown string."""
-        # Basic implementation using markdownify, assumes installed
         try:
-            import markdownify
-
             # Convert the specific element, not just its inner content
             # Use default options, maybe configure later if needed (e.g., heading style)
-            md = markdownify.markdownify(str(element), heading_style="ATX")
+            md = await _html_to_markdown(element, heading_style="ATX")
             # --- Truncate Markdown ---
             if len(md) > DEFAULT_MAX_SNIPPET_LENGTH:
                 md = md[:DEFAULT_MAX_SNIPPET_LENGTH] + "..."
             return md.strip()
-        except ImportError:
-            logger.warning(
-                "markdownify library not found. Falling back to plain text for markdown."
-            )
-            return element.get_text(strip=True)
         except Exception as e:
             logger.error(f"Error during markdown conversion: {e}")
             return f"Error converting to markdown: {e}"
@@ -92,7 +176,7 @@ class SelectorTools:
         if anchor_selector:
             try:
                 possible_anchors = self.soup.select(anchor_selector)
-            except Exception as e:
+            except SELECTOR_ERRORS as e:
                 error_msg = f"Anchor Selector Syntax Error: {type(e).__name__}: {e}"
                 logger.warning(f"{log_prefix}: {error_msg}")
                 return SelectorEvaluationResult(
@@ -138,7 +222,7 @@ class SelectorTools:
                     matched_html_snippets=None,
                 )
             base_element = possible_anchors[0]
-            logger.debug(f"{log_prefix}: Anchor found successfully.")
+            logger.debug("%s: Anchor found successfully.", log_prefix)
 
         assert base_element is not None, "Base element for evaluate_selector cannot be None"
 
@@ -146,6 +230,7 @@ class SelectorTools:
             elements = base_element.select(selector)
             count = len(elements)
             match_details: list[MatchDetail] = []
+            detail_elements: list[tuple[Tag, dict]] = []
 
             # --- Populate Match Details (Up to max_matches_to_detail or all if None) --- #
             for i, el in enumerate(elements):
@@ -173,15 +258,22 @@ class SelectorTools:
                     attrs = {
                         k: " ".join(v) if isinstance(v, list) else v for k, v in el.attrs.items()
                     }
-                    # Extract full markdown content using the helper (will be truncated by helper)
-                    markdown_content = self._convert_html_to_markdown(el)
-                    match_details.append(
-                        MatchDetail(
-                            tag_name=el.name,
-                            text_content=markdown_content,  # Use full markdown
-                            attributes=attrs,
-                        )
+                    detail_elements.append((el, attrs))
+
+            # Extract markdown for all detailed matches concurrently (truncated by helper)
+            markdown_contents = await asyncio.gather(
+                *(self._convert_html_to_markdown(el) for el, _ in detail_elements)
+            )
+            for (el, attrs), markdown_content in zip(
+                detail_elements, markdown_contents, strict=True
+            ):
+                match_details.append(
+                    MatchDetail(
+                        tag_name=el.name,
+                        text_content=markdown_content,  # Use full markdown
+                        attributes=attrs,
                     )
+                )
             # --- End Populate Match Details --- #
 
             # --- Perform size validation if unique element found --- #
@@ -202,7 +294,10 @@ class SelectorTools:
                         logger.warning(f"{log_prefix}: {size_validation_error_msg}")
                     else:
                         logger.debug(
-                            f"{log_prefix}: Size validation OK ({html_len} chars <= {effective_max_html_length})"
+                            "%s: Size validation OK (%d chars <= %d)",
+                            log_prefix,
+                            html_len,
+                            effective_max_html_length,
                         )
                 except Exception as size_err:
                     size_validation_error_msg = f"Error during size validation: {size_err}"
@@ -234,9 +329,9 @@ class SelectorTools:
                 if not simplicity_warning:
                     # Re-use markdown if already calculated, else calculate it now
                     markdown_content = (
-                        markdown_content
-                        if "markdown_content" in locals()
-                        else self._convert_html_to_markdown(first_el)
+                        markdown_contents[0]
+                        if detail_elements and detail_elements[0][0] is first_el
+                        else await self._convert_html_to_markdown(first_el)
                     )
                     markdown_len = len(markdown_content)
                     if markdown_len > max_markdown_len_threshold:
@@ -260,7 +355,7 @@ class SelectorTools:
                 f"{log_prefix}: Result: Count={result.element_count}, TextFound={result.target_text_found_in_any_match}, MatchesDetailed={len(result.matches)}"
             )
             # Slightly more detailed log for the first match if present
-            if result.matches:
+            if result.matches and logger.isEnabledFor(logging.DEBUG):
                 first = result.matches[0]
                 # Log truncated markdown for brevity in this specific log line
                 log_md_preview = (
@@ -269,7 +364,11 @@ class SelectorTools:
                     else first.text_content
                 )
                 logger.debug(
-                    f"{log_prefix}: First Match: <{first.tag_name}> attrs={first.attributes} markdown='{log_md_preview}'"
+                    "%s: First Match: <%s> attrs=%s markdown='%s'",
+                    log_prefix,
+                    first.tag_name,
+                    first.attributes,
+                    log_md_preview,
                 )
             return result
         except Exception as e:
@@ -307,7 +406,7 @@ class SelectorTools:
         if anchor_selector:
             try:
                 possible_anchors = self.soup.select(anchor_selector)
-            except Exception as e:
+            except SELECTOR_ERRORS as e:
                 error_msg = f"Anchor Selector Syntax Error: {type(e).__name__}: {e}"
                 logger.warning(f"{log_prefix}: {error_msg}")
                 return ChildrenTagsResult(
@@ -341,7 +440,7 @@ class SelectorTools:
                     children_details=None,
                 )
             base_element = possible_anchors[0]
-            logger.debug(f"{log_prefix}: Anchor found successfully.")
+            logger.debug("%s: Anchor found successfully.", log_prefix)
 
         assert base_element is not None, "Base element for get_children_tags cannot be None"
 
@@ -421,7 +520,7 @@ class SelectorTools:
         if anchor_selector:
             try:
                 possible_anchors = self.soup.select(anchor_selector)
-            except Exception as e:
+            except SELECTOR_ERRORS as e:
                 error_msg = f"Anchor Selector Syntax Error: {type(e).__name__}: {e}"
                 logger.warning(f"{log_prefix}: {error_msg}")
                 return SiblingsResult(
@@ -455,7 +554,7 @@ class SelectorTools:
                     siblings=[],
                 )
             base_element = possible_anchors[0]
-            logger.debug(f"{log_prefix}: Anchor found successfully.")
+            logger.debug("%s: Anchor found successfully.", log_prefix)
 
         assert base_element is not None, "Base element for sibling search cannot be None"
 
@@ -473,7 +572,7 @@ class SelectorTools:
                 )
 
             siblings_details: list[SiblingDetail] = []
-            logger.debug(f"{log_prefix}: Reference element found: <{element.name}>")
+            logger.debug("%s: Reference element found: <%s>", log_prefix, element.name)
 
             siblings_summary_list = []
             # Previous sibling - ensuring it's a Tag
@@ -488,7 +587,7 @@ class SelectorTools:
                     SiblingDetail(tag_name=prev_sib.name, direction="previous", attributes=attrs)
                 )
                 logger.debug(
-                    f"{log_prefix}: Found Previous Sibling: <{prev_sib.name}> attrs={attrs}"
+                    "%s: Found Previous Sibling: <%s> attrs=%s", log_prefix, prev_sib.name, attrs
                 )
                 siblings_summary_list.append(f"prev=<{prev_sib.name}>")
 
@@ -503,7 +602,9 @@ class SelectorTools:
                 siblings_details.append(
                     SiblingDetail(tag_name=next_sib.name, direction="next", attributes=attrs)
                 )
-                logger.debug(f"{log_prefix}: Found Next Sibling: <{next_sib.name}> attrs={attrs}")
+                logger.debug(
+                    "%s: Found Next Sibling: <%s> attrs=%s", log_prefix, next_sib.name, attrs
+                )
                 siblings_summary_list.append(f"next=<{next_sib.name}>")
 
             siblings_summary = ", ".join(siblings_summary_list) if siblings_summary_list else "None"
@@ -552,7 +653,7 @@ class SelectorTools:
         if anchor_selector:
             try:
                 possible_anchors = self.soup.select(anchor_selector)
-            except Exception as e:
+            except SELECTOR_ERRORS as e:
                 error_msg = f"Anchor Selector Syntax Error: {type(e).__name__}: {e}"
                 logger.warning(f"{log_prefix}: {error_msg}")
                 return ExtractionResult(
@@ -614,12 +715,12 @@ class SelectorTools:
                 if len(html_content_val) > DEFAULT_MAX_SNIPPET_LENGTH:
                     html_preview = html_content_val[:DEFAULT_MAX_SNIPPET_LENGTH] + "..."
                     logger.debug(
-                        f"{log_prefix}: Extracted HTML content (truncated): '{html_preview}'"
+                        "%s: Extracted HTML content (truncated): '%s'", log_prefix, html_preview
                     )
                     html_content_val = html_preview  # Return truncated value
                 else:
                     logger.debug(
-                        f"{log_prefix}: Extracted HTML content: '{html_content_val[:100]}...'"
+                        "%s: Extracted HTML content: '%.100s...'", log_prefix, html_content_val
                     )
             except Exception as html_err:
                 logger.warning(f"{log_prefix}: Failed to get HTML string: {html_err}")
@@ -650,18 +751,22 @@ class SelectorTools:
                             links_processed_count += 1
                 if links_processed_count > 0:
                     logger.debug(
-                        f"{log_prefix}: Absolutified {links_processed_count} href(s) in element copy before markdown conversion."
+                        "%s: Absolutified %d href(s) in element copy before markdown conversion.",
+                        log_prefix,
+                        links_processed_count,
                     )
                 # --- End Pre-process --- #
 
                 try:
                     # Use the modified copy for markdown conversion
-                    markdown_content_val = markdownify(str(element_copy), base_url=self.base_url)
+                    markdown_content_val = await _html_to_markdown(
+                        element_copy, base_url=self.base_url
+                    )
                     if len(markdown_content_val) > DEFAULT_MAX_SNIPPET_LENGTH:
                         markdown_content_val = (
                             markdown_content_val[:DEFAULT_MAX_SNIPPET_LENGTH] + "..."
                         )
-                        logger.debug(f"{log_prefix}: Generated truncated markdown content.")
+                        logger.debug("%s: Generated truncated markdown content.", log_prefix)
                 except Exception as md_err:
                     logger.warning(f"{log_prefix}: Failed to generate markdown content: {md_err}")
                     markdown_content_val = f"Error generating markdown: {md_err}"
@@ -690,7 +795,7 @@ class SelectorTools:
                             )
                         else:
                             logger.debug(
-                                f"{log_prefix}: URL '{original_val}' was already absolute."
+                                "%s: URL '%s' was already absolute.", log_prefix, original_val
                             )
                 else:
                     logger.warning(
@@ -716,14 +821,18 @@ class SelectorTools:
                             links_processed_count += 1
                 if links_processed_count > 0:
                     logger.debug(
-                        f"{log_prefix}: Absolutified {links_processed_count} href(s) before final markdown conversion."
+                        "%s: Absolutified %d href(s) before final markdown conversion.",
+                        log_prefix,
+                        links_processed_count,
                     )
 
                 # --- Convert to Markdown and Truncate (again, ensure it happens regardless of path) ---
-                markdown_content_val = markdownify(str(element_copy_for_md), base_url=self.base_url)
+                markdown_content_val = await _html_to_markdown(
+                    element_copy_for_md, base_url=self.base_url
+                )
                 if len(markdown_content_val) > DEFAULT_MAX_SNIPPET_LENGTH:
                     markdown_content_val = markdown_content_val[:DEFAULT_MAX_SNIPPET_LENGTH] + "..."
-                    logger.debug(f"{log_prefix}: Final markdown content generated and truncated.")
+                    logger.debug("%s: Final markdown content generated and truncated.", log_prefix)
             except Exception as md_err:
                 logger.warning(f"{log_prefix}: Failed to generate markdown content: {md_err}")
                 markdown_content_val = f"Error generating markdown: {md_err}"
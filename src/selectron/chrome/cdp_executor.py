@@ -27,6 +27,7 @@ class CdpBrowserExecutor(BrowserExecutor):
         self._tab_url = tab_url
         self._provided_ws: Optional[Any] = ws_connection  # Revert to Any
         self._internal_ws: Optional[Any] = None  # Revert to Any
+        self._runtime_enabled_ws: Optional[Any] = None  # connection Runtime.enable was sent on
         self._lock = asyncio.Lock()  # To manage internal connection state
 
     @property
@@ -49,6 +50,7 @@ class CdpBrowserExecutor(BrowserExecutor):
                     # Enable Runtime domain immediately after internal connection
                     # Use self._internal_ws directly here as self._ws might return the (None) provided_ws
                     await send_cdp_command(self._internal_ws, "Runtime.enable")
+                    self._runtime_enabled_ws = self._internal_ws
                 except (
                     websockets.exceptions.WebSocketException,
                     OSError,
@@ -114,8 +116,10 @@ class CdpBrowserExecutor(BrowserExecutor):
     async def evaluate(self, expression: str, arg: Optional[dict] = None) -> Any:
         """Evaluates JavaScript expression in the page context."""
         # Ensure Runtime is enabled (send_command handles connection)
-        # Send Runtime.enable just in case, it's idempotent
-        await self._send_command("Runtime.enable")
+        # once per connection is enough, skip the extra round trip on every evaluate
+        if self._ws is None or self._ws is not self._runtime_enabled_ws:
+            await self._send_command("Runtime.enable")
+            self._runtime_enabled_ws = self._ws
 
         if arg is not None:
             # Fallback or default: Runtime.evaluate (less ideal for complex args)
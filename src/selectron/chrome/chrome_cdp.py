@@ -301,6 +301,52 @@ async def wait_for_page_load(ws, timeout: float = 15.0) -> bool:
         return False
 
 
+_NETWORK_REQUEST_DONE = ("Network.loadingFinished", "Network.loadingFailed")
+
+
+async def wait_for_network_idle(ws, idle_s: float = 0.3, timeout: float = 1.0) -> bool:
+    """Waits until no tracked request is in flight and the network has been quiet for `idle_s`.
+
+    Returns False if the page was still busy after `timeout` (callers proceed anyway).
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    if await send_cdp_command(ws, "Network.enable") is None:
+        logger.debug("Failed to enable Network domain; skipping network idle wait.")
+        return False
+    in_flight: set[str] = set()
+    try:
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                logger.debug(f"Network still busy after {timeout}s ({len(in_flight)} in flight).")
+                return False
+            try:
+                message = await asyncio.wait_for(ws.recv(), timeout=min(idle_s, remaining))
+            except asyncio.TimeoutError:
+                if not in_flight and deadline - loop.time() > 0:
+                    return True  # quiet for idle_s with nothing pending
+                continue
+            try:
+                event = json.loads(message)
+            except json.JSONDecodeError:
+                continue
+            method = event.get("method")
+            request_id = event.get("params", {}).get("requestId")
+            if method == "Network.requestWillBeSent" and request_id:
+                in_flight.add(request_id)
+            elif method in _NETWORK_REQUEST_DONE:
+                in_flight.discard(request_id)
+    except websockets.exceptions.ConnectionClosed:
+        logger.error("WebSocket closed while waiting for network idle.")
+        return False
+    finally:
+        try:
+            await send_cdp_command(ws, "Network.disable")
+        except websockets.exceptions.ConnectionClosed:
+            pass  # nothing left to disable
+
+
 async def get_tab_html(ws_url: str, settle_delay_s: float = 0.0) -> Optional[str]:
     """Connects to a specific tab's debugger WebSocket URL and retrieves its HTML,
     waiting for the page load event first.
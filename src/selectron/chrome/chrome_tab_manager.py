@@ -8,9 +8,9 @@ from PIL import Image
 from selectron.chrome.cdp_executor import CdpBrowserExecutor
 from selectron.chrome.chrome_cdp import (
     ChromeTab,
-    capture_tab_screenshot,
     get_final_url_and_title,
     get_html_via_ws,
+    wait_for_network_idle,
     wait_for_page_load,
 )
 from selectron.chrome.chrome_monitor import ChromeMonitor, TabChangeEvent
@@ -250,12 +250,13 @@ class ChromeTabManager:
         try:
             logger.debug(f"Connecting ws: {ws_url}")
             # Ensure imports for websockets, wait_for_page_load, get_final_url_and_title, get_html_via_ws,
-            # capture_tab_screenshot, DomService, CdpBrowserExecutor, DOM_STRING_INCLUDE_ATTRIBUTES are present.
+            # DomService, CdpBrowserExecutor, DOM_STRING_INCLUDE_ATTRIBUTES are present.
             ws = await websockets.connect(ws_url, max_size=20 * 1024 * 1024, open_timeout=10)
             logger.debug(f"Connected ws for {tab.id}")
             loaded = await wait_for_page_load(ws)
             logger.debug(f"Page load status {tab.id}: {loaded}")
-            await asyncio.sleep(1.0)  # Settle delay
+            # settle: returns as soon as the network is quiet (at most 1s, as the fixed delay was)
+            await wait_for_network_idle(ws)
             final_url, final_title = await get_final_url_and_title(
                 ws, tab.url, tab.title or "Unknown"
             )
@@ -272,9 +273,6 @@ class ChromeTabManager:
                             )
                     except Exception as dom_e:
                         logger.exception(f"Error fetching DOM for {final_url}: {dom_e}")
-                # Capture screenshot regardless of DOM fetch success if URL/title are okay
-                if final_title:  # Check title as proxy for basic page accessibility
-                    await capture_tab_screenshot(ws_url=ws_url, ws_connection=ws)
             else:
                 logger.warning(f"Could not get final URL for {tab.id}")
         except Exception as e:
@@ -1,6 +1,6 @@
 import asyncio
 
-from rich.console import Console
+from rich import get_console
 from rich.prompt import Confirm
 
 from selectron.chrome.chrome_launcher import (
@@ -12,7 +12,8 @@ from selectron.chrome.chrome_launcher import (
 from selectron.util.logger import get_logger
 
 logger = get_logger(__name__)
-console = Console()
+# rich's process-wide console, already used by Confirm prompts and the log RichHandler
+console = get_console()
 
 
 async def ensure_chrome_connection() -> bool:
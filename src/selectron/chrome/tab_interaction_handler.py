@@ -52,6 +52,11 @@ class TabInteractionHandler:
         self._rehighlight_debounce_timer: Optional[asyncio.TimerHandle] = None
         self._is_running = False
         self._last_interaction_scroll_y: Optional[int] = None  # Store last scrollY here
+        self._fetch_ws = None  # CDP connection reused across fetches (fetches never overlap)
+        self._fetch_ws_url: Optional[str] = None
+        # DOM string of the last fetch, keyed by (url, hash(html)); unchanged pages skip the DOM walk
+        self._dom_string_key: Optional[tuple[str, int]] = None
+        self._dom_string: Optional[str] = None
 
     async def start(self):
         """Starts the interaction monitoring loop for the tab."""
@@ -104,6 +109,7 @@ class TabInteractionHandler:
             except Exception as e:
                 logger.error(f"Error waiting for fetch task cancellation for {self.tab_id}: {e}")
         self._fetch_task = None
+        await self._close_fetch_ws()
         # logger.debug(f"Interaction monitor stopped for tab {self.tab_id}") # Reduced noise
 
     def _handle_monitor_completion(self, task: asyncio.Task):
@@ -286,6 +292,30 @@ class TabInteractionHandler:
         # Ensure the task reference is cleared once it completes
         self._fetch_task.add_done_callback(lambda _task: setattr(self, "_fetch_task", None))
 
+    async def _get_fetch_ws(self, ws_url: str):
+        """Returns the pooled fetch connection for ws_url, connecting only if it is missing or closed."""
+        if (
+            self._fetch_ws is not None
+            and self._fetch_ws_url == ws_url
+            and self._fetch_ws.state != websockets.protocol.State.CLOSED
+        ):
+            return self._fetch_ws
+        await self._close_fetch_ws()
+        self._fetch_ws = await websockets.connect(
+            ws_url, max_size=30 * 1024 * 1024, open_timeout=10, close_timeout=10
+        )
+        self._fetch_ws_url = ws_url
+        return self._fetch_ws
+
+    async def _close_fetch_ws(self):
+        """Closes and forgets the pooled fetch connection, if any."""
+        ws, self._fetch_ws, self._fetch_ws_url = self._fetch_ws, None, None
+        if ws is not None and ws.state != websockets.protocol.State.CLOSED:
+            try:
+                await ws.close()
+            except Exception as e:
+                logger.debug(f"Error closing fetch websocket for tab {self.tab_id}: {e}")
+
     async def _fetch_and_process_tab_content(self):
         """Fetches HTML, screenshot, and DOM for the tab and calls the content_fetched_callback."""
         html_content: Optional[str] = None
@@ -293,7 +323,6 @@ class TabInteractionHandler:
         dom_string: Optional[str] = None  # Add variable for DOM string
         fetched_tab_ref: Optional[TabReference] = None
         scroll_y_at_capture: Optional[int] = None
-        ws = None
 
         try:
             # Get the current tab info first
@@ -316,9 +345,7 @@ class TabInteractionHandler:
             latest_title = target_tab_obj.title  # Get latest title
 
             # --- Connect to WebSocket --- Need connection for multiple commands
-            ws = await websockets.connect(
-                ws_url, max_size=30 * 1024 * 1024, open_timeout=10, close_timeout=10
-            )
+            ws = await self._get_fetch_ws(ws_url)
 
             # --- Instantiate CDP Executor with existing connection --- #
             # Use the executor to ensure Runtime.enable is called if needed
@@ -337,7 +364,11 @@ class TabInteractionHandler:
                 )
 
             # --- Fetch DOM State --- #
-            if html_content:  # Only try getting DOM if we have HTML
+            dom_string_key = (current_url, hash(html_content)) if html_content else None
+            if dom_string_key is not None and dom_string_key == self._dom_string_key:
+                dom_string = self._dom_string
+                logger.debug(f"HTML unchanged for {self.tab_id}, reusing cached DOM string")
+            elif html_content:  # Only try getting DOM if we have HTML
                 try:
                     # Create DomService instance
                     dom_service = DomService(browser_executor)
@@ -353,6 +384,9 @@ class TabInteractionHandler:
                             logger.warning(
                                 f"DOM string is missing or too short for {self.tab_id}: {dom_string[:100] if dom_string else 'None'}"
                             )
+                        else:
+                            self._dom_string_key = dom_string_key
+                            self._dom_string = dom_string
                     else:
                         logger.warning(f"get_elements returned empty state for {self.tab_id}")
                 except Exception as dom_e:
@@ -422,6 +456,5 @@ class TabInteractionHandler:
             logger.error(
                 f"Error fetching/processing tab {self.tab_id} after interaction: {e}", exc_info=True
             )
-        finally:
-            if ws and ws.state != websockets.protocol.State.CLOSED:
-                await ws.close()
+            # Drop the pooled connection so the next fetch starts from a fresh one
+            await self._close_fetch_ws()
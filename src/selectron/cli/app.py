@@ -1,6 +1,8 @@
 import asyncio
+import hashlib
 import os
 import webbrowser
+from collections import OrderedDict
 from typing import Literal, Optional
 
 # Add duckdb import
@@ -10,6 +12,7 @@ from rich.markup import escape
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Container
+from textual.css.query import NoMatches
 from textual.timer import Timer
 from textual.widgets import (
     Button,
@@ -18,6 +21,7 @@ from textual.widgets import (
     Header,
     Input,
     Label,
+    Static,
     TabbedContent,
     TabPane,
 )
@@ -31,6 +35,7 @@ from selectron.ai.selector_agent import (
     SelectorAgent,
     SelectorAgentError,
 )
+from selectron.ai.selector_tools import SelectorTools
 from selectron.ai.types import (
     SelectorProposal,
 )
@@ -55,6 +60,9 @@ DEFAULT_THEME = THEME_LIGHT
 
 AiStatus = Literal["enabled_anthropic", "enabled_openai", "disabled"]
 
+# Max number of parsed SelectorTools instances kept for re-runs on unchanged HTML
+SELECTOR_TOOLS_CACHE_SIZE = 4
+
 
 class SelectronApp(App[None]):
     _debug_write_selection: bool = os.getenv("SLT_DBG_WRITE_SELECTION", "false").lower() == "true"
@@ -77,11 +85,17 @@ class SelectronApp(App[None]):
     _propose_selection_done_for_tab: Optional[str] = None
     _input_debounce_timer: Optional[Timer] = None
     _monitor_handler: Optional[MonitorEventHandler] = None
+    # widgets touched from frequent callbacks, resolved once (the layout is never re-composed)
+    _data_table: Optional[DataTable] = None
+    _agent_status_label: Optional[Static] = None
     _duckdb_ui_conn: Optional[duckdb.DuckDBPyConnection] = (
         None  # ADDED: Store connection for DuckDB UI
     )
     _model_config: ModelConfig
     _ai_status: AiStatus
+    _selector_tools_cache: "OrderedDict[tuple[str, str, bytes], SelectorTools]"
+    # (url, selector) pairs generated this session; generating one again skips the run cache
+    _codegen_done_for: set[tuple[str, str]]
 
     def __init__(self, model_config: ModelConfig):
         super().__init__()
@@ -90,6 +104,22 @@ class SelectronApp(App[None]):
         self._highlighter = ChromeHighlighter()
         self._model_config = model_config
         self._ai_status = self._determine_ai_status(model_config)
+        self._selector_tools_cache = OrderedDict()
+        self._codegen_done_for = set()
+
+    def _get_selector_tools(self, tab_id: str, base_url: str, html: str) -> SelectorTools:
+        """Return a SelectorTools for this HTML, reusing the parsed soup if unchanged (small LRU)."""
+        key = (tab_id, base_url, hashlib.blake2b(html.encode(), digest_size=8).digest())
+        tools = self._selector_tools_cache.get(key)
+        if tools is not None:
+            self._selector_tools_cache.move_to_end(key)
+            logger.debug("Reusing parsed SelectorTools for tab %s", tab_id)
+            return tools
+        tools = SelectorTools(html_content=html, base_url=base_url)
+        self._selector_tools_cache[key] = tools
+        while len(self._selector_tools_cache) > SELECTOR_TOOLS_CACHE_SIZE:
+            self._selector_tools_cache.popitem(last=False)
+        return tools
 
     def _determine_ai_status(self, config: ModelConfig) -> AiStatus:
         if config.provider == "anthropic":
@@ -124,8 +154,8 @@ class SelectronApp(App[None]):
 
     async def on_mount(self) -> None:
         try:
-            table = self.query_one(DataTable)
-            table.cursor_type = "row"
+            self._data_table = self.query_one(DataTable)
+            self._data_table.cursor_type = "row"
         except Exception as table_init_err:
             logger.error(f"Failed to initialize DataTable: {table_init_err}", exc_info=True)
         self.theme = DEFAULT_THEME
@@ -142,7 +172,7 @@ class SelectronApp(App[None]):
         # Instantiate MonitorEventHandler after widgets are potentially available
         try:
             url_label = self.query_one("#active-tab-url-label", Label)
-            data_table = self.query_one(DataTable)
+            data_table = self._data_table or self.query_one(DataTable)
             prompt_input = self.query_one("#prompt-input", Input)
             self._monitor_handler = MonitorEventHandler(
                 app=self,
@@ -419,8 +449,9 @@ class SelectronApp(App[None]):
                 await self._update_ui_status("Error: Not connected", state="received_error")
                 return
 
-            # Clear previous highlights before starting a new agent run for this tab
-            await self._highlighter.clear(self._active_tab_ref)
+            # Clear previous highlights before starting a new agent run for this tab. Scheduled, not
+            # awaited: the agent's first highlight is an LLM round-trip away and clears again anyway.
+            self.call_later(self._highlighter.clear, self._active_tab_ref)
 
             # Disable parser button when starting a new selection
             self._set_parser_button_enabled(False)
@@ -500,28 +531,11 @@ class SelectronApp(App[None]):
     async def _update_ui_status(self, message: str, state: str, show_spinner: bool = False) -> None:
         """Helper to update both the terminal label and the browser badge."""
         try:
-            home_panels = self.query(HomePanel)  # Query for the parent panel first
-            if home_panels:
-                # Query within the first found HomePanel for the specific label ID
-                # The expected type is implicitly Label if the selector targets an ID
-                # or more specific selector usually implies the type.
-                # Pass the type only if querying generically (e.g., query(Widget)).
-                status_labels = home_panels[0].query("#agent-status-label")
-                # We might need to assert the type or check isinstance if query returns NodeList[DOMNode]
-                if status_labels:
-                    node = status_labels[0]
-                    if isinstance(node, Label):
-                        node.update(escape(message))  # Now using the correctly typed variable
-                    else:
-                        logger.warning(
-                            f"NOTE: Found element '#agent-status-label' but it is not a Label (type: {type(node)})."
-                        )
-                else:
-                    logger.warning(
-                        "NOTE: Found HomePanel, but could not find '#agent-status-label' within it."
-                    )
+            status_label = self._get_agent_status_label()
+            if status_label:
+                status_label.update(escape(message))
             else:
-                logger.warning("NOTE: Could not find 'HomePanel' to update status label.")
+                logger.warning("NOTE: Could not find '#agent-status-label' to update status.")
         except Exception as e:
             # Catch other potential errors during query or update
             logger.error(f"Failed during status label update: {e}", exc_info=True)
@@ -536,9 +550,18 @@ class SelectronApp(App[None]):
                 logger.error(f"Failed to show agent status badge: {e}", exc_info=True)
         else:
             logger.debug(
-                f"Skipping browser badge update for status '{message}' (no active tab ref)."
+                "Skipping browser badge update for status '%s' (no active tab ref).", message
             )
 
+    def _get_agent_status_label(self) -> Optional[Static]:
+        """Returns the HomePanel status label, querying the DOM only on first use."""
+        if self._agent_status_label is None:
+            try:
+                self._agent_status_label = self.query_one("#agent-status-label", Static)
+            except NoMatches:
+                return None
+        return self._agent_status_label
+
     def action_open_log_file(self) -> None:
         try:
             log_panel_widget = self.query_one(LogPanel)
@@ -609,6 +632,7 @@ class SelectronApp(App[None]):
                 status_cb=status_callback,
                 highlighter=highlighter_adapter,
                 debug_dump=self._debug_write_selection,
+                tools=self._get_selector_tools(tab_ref.id, current_url, current_html),
             )
 
             logger.info(
@@ -789,8 +813,10 @@ class SelectronApp(App[None]):
                 logger.debug("Skipping parser re-apply check: Target ref or its URL is missing.")
 
     async def _clear_table_view(self) -> None:
+        if self._monitor_handler:
+            self._monitor_handler.invalidate_extract()  # table no longer reflects last extract
         try:
-            table = self.query_one(DataTable)
+            table = self._data_table or self.query_one(DataTable)
             table.clear(columns=True)
         except Exception as e:
             logger.error(f"Failed to query or clear data table: {e}")
@@ -824,8 +850,9 @@ class SelectronApp(App[None]):
         if self._active_tab_ref:
             await self._highlighter.hide_agent_status(self._active_tab_ref)
         try:
-            status_label = self.query_one("#agent-status-label", Label)
-            status_label.update("Interact with a page in Chrome to get started")
+            status_label = self._get_agent_status_label()
+            if status_label:
+                status_label.update("Interact with a page in Chrome to get started")
         except Exception as e:
             logger.warning(f"Failed to reset status label after delay: {e}")
 
@@ -963,6 +990,7 @@ class SelectronApp(App[None]):
         )
 
         # Run CodegenAgent
+        codegen_key = (tab_ref.url or "", selector)
         try:
             codegen_agent = CodegenAgent(
                 html_samples=html_samples,
@@ -972,6 +1000,8 @@ class SelectronApp(App[None]):
                 input_selector=selector,
                 input_selector_description=selector_description,
                 status_cb=self._update_ui_status,
+                # a cached parser is only reused on the first request; clicking again regenerates
+                use_cache=codegen_key not in self._codegen_done_for,
             )
 
             logger.info(f"Starting CodegenAgent for url '{tab_ref.url}' with selector '{selector}'")
@@ -982,6 +1012,7 @@ class SelectronApp(App[None]):
 
             _ = (generated_code, outputs)  # silence unused variable lints
 
+            self._codegen_done_for.add(codegen_key)
             logger.info("CodegenAgent finished successfully. Triggering parser reload.")
 
             if self._monitor_handler:
@@ -145,8 +145,7 @@ class HomePanel(Container):
                     Button("Retry Status Check", id="check-chrome-status", variant="error"),
                 ]
 
-            # Mount the new widgets
-            for widget in widgets_to_mount:
-                await status_container.mount(widget)  # Mount into the inner container
+            # Mount the new widgets in one batch (single layout pass)
+            await status_container.mount_all(widgets_to_mount)
 
         self.app.call_later(clear_and_mount)
@@ -1,17 +1,40 @@
+import os
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TextIO
 
 from rich.text import Text
 from textual.app import ComposeResult
 from textual.containers import Container
 from textual.widgets import RichLog
+from watchfiles import awatch
 
 from selectron.util.logger import get_logger
 from selectron.util.open_log_file import open_log_file
 
 logger = get_logger(__name__)
 
+# util/logger.py renders levels as "[DEBUG]", "[INFO ]", "[WARNING]", ... so one marker suffices
+_DEBUG_MARK = "[DEBUG]"
+# ...right after the fixed-width "%Y-%m-%d %H:%M:%S " timestamp
+_LEVEL_START = 20
+_LEVEL_END = _LEVEL_START + len(_DEBUG_MARK)
+# Only the tail of a stale log is shown on mount, so startup cost is independent of its size
+_INITIAL_LOG_TAIL_BYTES = 256 * 1024
+
+
+def _is_info_or_higher(log_line: str) -> bool:
+    """True unless the line is a DEBUG record (continuation lines, e.g. tracebacks, pass)."""
+    return log_line[_LEVEL_START:_LEVEL_END] != _DEBUG_MARK  # fixed-offset compare, not a scan
+
+
+def _filter_info_or_higher(log_text: str) -> str:
+    """Drop DEBUG lines from a chunk of log text."""
+    if _DEBUG_MARK not in log_text:  # fast path: one scan, nothing to drop
+        return log_text
+    is_info = _is_info_or_higher
+    return "".join(line for line in log_text.splitlines(keepends=True) if is_info(line))
+
 
 class LogPanel(Container):
     def __init__(
@@ -26,7 +49,7 @@ class LogPanel(Container):
         super().__init__(name=name, id=id, classes=classes, disabled=disabled)
         self._log_file_path = log_file_path
         self._watch_interval = watch_interval
-        self._last_log_position = 0
+        self._log_fh: Optional[TextIO] = None  # kept open for the panel's lifetime
         self._rich_log: Optional[RichLog] = None
         # Ensure log file exists (logger.py should also do this)
         self._log_file_path.parent.mkdir(parents=True, exist_ok=True)
@@ -45,7 +68,42 @@ class LogPanel(Container):
         self._rich_log = self.query_one("#log-panel-internal", RichLog)
         self._clear_log_file()
         self._load_initial_logs()
-        self.set_interval(self._watch_interval, self._watch_log_file)
+        self.run_worker(self._awatch_log_file(), group="log_watch", exclusive=True)
+
+    def on_unmount(self) -> None:
+        """Close the persistent log file handle."""
+        if self._log_fh:
+            self._log_fh.close()
+            self._log_fh = None
+
+    def _get_log_handle(self) -> Optional[TextIO]:
+        """Return the open log handle, reopening/rewinding if the file was replaced or truncated."""
+        try:
+            if self._log_fh:
+                fh_stat = os.fstat(self._log_fh.fileno())
+                path_stat = os.stat(self._log_file_path)
+                if fh_stat.st_ino != path_stat.st_ino:  # file replaced (e.g. rotated)
+                    self._log_fh.close()
+                    self._log_fh = None
+                elif fh_stat.st_size < self._log_fh.tell():  # file truncated in place
+                    self._log_fh.seek(0)
+            if not self._log_fh:
+                self._log_fh = open(self._log_file_path, "r", encoding="utf-8", errors="replace")
+        except FileNotFoundError:
+            return None
+        return self._log_fh
+
+    async def _awatch_log_file(self) -> None:
+        """Wake on OS file-change notifications for the log file (no fixed-interval polling)."""
+        log_path = self._log_file_path.resolve()
+        # watch the parent dir so truncation/recreation is seen; ignore sibling files
+        async for _changes in awatch(
+            log_path.parent,
+            watch_filter=lambda _change, path: Path(path) == log_path,
+            debounce=int(self._watch_interval * 1000),  # upper bound on batching during bursts
+            recursive=False,
+        ):
+            await self._watch_log_file()
 
     def _load_initial_logs(self) -> None:
         """Load existing content from the log file into the panel, filtering for INFO+."""
@@ -53,17 +111,21 @@ class LogPanel(Container):
             logger.warning("Cannot load initial logs: RichLog not yet available.")
             return
         try:
-            if self._log_file_path.exists():
-                with open(self._log_file_path, "r", encoding="utf-8") as f:
-                    log_content = f.read()
-                    self._last_log_position = f.tell()
-                    if log_content:
-                        self._rich_log.write(log_content)
+            log_fh = self._get_log_handle()
+            if log_fh:
+                start = max(0, os.fstat(log_fh.fileno()).st_size - _INITIAL_LOG_TAIL_BYTES)
+                if start:
+                    log_fh.seek(start)
+                    log_fh.readline()  # discard the partial line we landed in
+                # filter while iterating the file so the raw content is never held as one string
+                is_info = _is_info_or_higher
+                log_content = "".join(line for line in log_fh if is_info(line))
+                if log_content:
+                    self._rich_log.write(log_content)
             else:
                 self._rich_log.write(
                     Text(f"Log file not found: {self._log_file_path}", style="yellow")
                 )
-                self._last_log_position = 0
         except Exception as e:
             err_msg = f"Error loading initial log file {self._log_file_path}: {e}"
             self._rich_log.write(Text(err_msg, style="red"))
@@ -74,7 +136,8 @@ class LogPanel(Container):
         try:
             # Opening with 'w' mode truncates the file.
             open(self._log_file_path, "w", encoding="utf-8").close()
-            self._last_log_position = 0  # Reset position after clearing
+            if self._log_fh:
+                self._log_fh.seek(0)  # Reset position after clearing
         except Exception as e:
             err_msg = f"ERROR: Failed to clear log file {self._log_file_path} on mount: {e}"
             # Log to stderr as the logger might write to the file we just failed to clear
@@ -84,19 +147,21 @@ class LogPanel(Container):
                 self._rich_log.write(Text(err_msg + "\n", style="red"))
 
     async def _watch_log_file(self) -> None:
-        """Periodically check the log file for new content, filter for INFO+, and append it."""
+        """Read content appended to the log file since the last read, filter for INFO+, and append it."""
         if not self._rich_log:
             return
         try:
-            if not self._log_file_path.exists():
+            log_fh = self._get_log_handle()
+            if not log_fh:
                 return
 
-            with open(self._log_file_path, "r", encoding="utf-8") as f:
-                f.seek(self._last_log_position)
-                new_content = f.read()
-                if new_content:
-                    self._rich_log.write(new_content)
-                    self._last_log_position = f.tell()
+            if os.fstat(log_fh.fileno()).st_size == log_fh.tell():
+                return  # nothing appended since the last read (e.g. metadata-only change)
+
+            # resumes from the handle's current offset
+            new_content = _filter_info_or_higher(log_fh.read())
+            if new_content:
+                self._rich_log.write(new_content)
         except Exception as e:
             # Avoid logging the error back to the log file causing a potential loop
             err_text = Text(f"Error reading log file {self._log_file_path}: {e}\n", style="red")
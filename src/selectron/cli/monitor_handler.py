@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
-from bs4 import BeautifulSoup
 from PIL import Image
 from textual.widgets import Button, DataTable, Input, Label
 
@@ -14,6 +14,7 @@ from selectron.chrome.chrome_highlighter import ChromeHighlighter
 from selectron.chrome.chrome_monitor import TabChangeEvent
 from selectron.chrome.types import TabReference
 from selectron.cli.duckdb_utils import save_parsed_results
+from selectron.parse.execution import compile_parser_code, parser_sandbox
 from selectron.parse.parser_registry import ParserRegistry
 from selectron.util.logger import get_logger
 
@@ -24,6 +25,9 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+# Content fetches arriving within this window are coalesced; only the latest is processed
+CONTENT_UPDATE_DEBOUNCE_SECONDS = 0.15
+
 
 class MonitorEventHandler:
     """Handles callbacks from the ChromeMonitor."""
@@ -54,6 +58,21 @@ class MonitorEventHandler:
         self._current_parser_info: Optional[Tuple[Dict[str, Any], str, Path]] = None
         # Store the slug key of the chosen parser
         self._current_parser_slug: Optional[str] = None
+        # Hash of the inputs behind the rows currently shown in the data table
+        self._last_extract_key: Optional[int] = None
+        # (tab id, selector, code, page HTML digest) of that extract; lets an unchanged page
+        # skip the live element fetch entirely
+        self._last_extract_page_key: Optional[Tuple[str, str, str, bytes]] = None
+        # Latest not-yet-processed content fetch, and the task draining it
+        self._pending_content: Optional[
+            Tuple[TabReference, Optional[Image.Image], Optional[int], Optional[str]]
+        ] = None
+        self._content_task: Optional[asyncio.Task[None]] = None
+
+    def invalidate_extract(self) -> None:
+        """Forget the extract on screen, so the next one re-fetches and re-fills the table."""
+        self._last_extract_key = None
+        self._last_extract_page_key = None
 
     async def handle_polling_change(self, event: TabChangeEvent) -> None:
         """Handles tab navigation/changes detected by polling."""
@@ -106,6 +125,30 @@ class MonitorEventHandler:
         screenshot: Optional[Image.Image],
         scroll_y: Optional[int],
         dom_string: Optional[str],
+    ) -> None:
+        """Queues a fetched content update; bursts are coalesced into one trailing update."""
+        self._pending_content = (tab_ref, screenshot, scroll_y, dom_string)
+        if self._content_task and not self._content_task.done():
+            return  # the running drain task will pick up the newest update
+        self._content_task = asyncio.create_task(self._drain_pending_content())
+
+    async def _drain_pending_content(self) -> None:
+        while self._pending_content is not None:
+            await asyncio.sleep(CONTENT_UPDATE_DEBOUNCE_SECONDS)
+            pending, self._pending_content = self._pending_content, None
+            if pending is None:
+                continue
+            try:
+                await self._process_content_fetched(*pending)
+            except Exception as e:
+                logger.error(f"Error processing fetched content: {e}", exc_info=True)
+
+    async def _process_content_fetched(
+        self,
+        tab_ref: TabReference,
+        screenshot: Optional[Image.Image],
+        scroll_y: Optional[int],
+        dom_string: Optional[str],
     ) -> None:
         """Handles updates after tab content (HTML, screenshot, DOM) is fetched."""
         # Logic moved from SelectronApp._handle_content_fetched
@@ -333,7 +376,6 @@ class MonitorEventHandler:
         self, tab_ref: TabReference, parser_dict: Dict[str, Any]
     ) -> None:
         """Execute parser python code against each selected element's HTML (fetched live) and display results as columns."""
-        import json
         import reprlib
 
         selector = parser_dict.get("selector")
@@ -344,9 +386,9 @@ class MonitorEventHandler:
             return
 
         # Prepare sandbox
-        sandbox: dict[str, Any] = {"BeautifulSoup": BeautifulSoup, "json": json}
+        sandbox = parser_sandbox()
         try:
-            exec(python_code, sandbox)
+            exec(compile_parser_code(python_code), sandbox)
         except Exception as e:
             logger.error(f"Parser execution error during exec: {e}", exc_info=True)
             return
@@ -356,6 +398,15 @@ class MonitorEventHandler:
             logger.error("Parser does not define a callable 'parse_element' function.")
             return
 
+        # Same page HTML as the extract already on screen -> same elements, nothing to redo
+        page_key = None
+        if tab_ref.html:
+            page_digest = hashlib.blake2b(tab_ref.html.encode(), digest_size=8).digest()
+            page_key = (tab_ref.id, selector, python_code, page_digest)
+            if page_key == self._last_extract_page_key and self._last_extract_key is not None:
+                logger.debug("Parser extract skipped: page HTML unchanged.")
+                return
+
         # Get element HTML directly from the browser
         try:
             element_htmls = await self._highlighter.get_elements_html(
@@ -373,6 +424,13 @@ class MonitorEventHandler:
             await self.app._clear_table_view()  # clear table if no results
             return
 
+        # Skip re-parsing and re-filling the table when nothing changed since the last extract
+        extract_key = hash((tab_ref.id, selector, python_code, tuple(element_htmls)))
+        if extract_key == self._last_extract_key:
+            logger.debug("Parser extract skipped: matched elements unchanged.")
+            self._last_extract_page_key = page_key
+            return
+
         # Execute parser on each element and collect results without blocking event loop
         results_data: list[dict[str, Any] | None] = []
 
@@ -428,19 +486,23 @@ class MonitorEventHandler:
             repr_short.maxstring = 50
             repr_short.maxother = 50
 
+            # loop invariants, hoisted out of the per-row work
+            repr_value = repr_short.repr
+            placeholder_row = ["-"] * len(column_keys)
+            row_key_prefix = f"parsed_{tab_ref.id}_"
+
             for i, parsed_dict in enumerate(results_data):  # Unpack only the dict
-                row_data = []  # Changed initialization from [html_snippet]
                 if isinstance(parsed_dict, dict):
-                    for key in column_keys:
-                        # represent value concisely
-                        value = parsed_dict.get(key)
-                        row_data.append(repr_short.repr(value))
+                    # represent values concisely
+                    row_data = [repr_value(parsed_dict.get(key)) for key in column_keys]
                 else:
                     # Add placeholders if parsing failed or returned non-dict
-                    row_data.extend(["-"] * len(column_keys))
+                    row_data = placeholder_row
 
-                table.add_row(*row_data, key=f"parsed_{tab_ref.id}_{i}")
+                table.add_row(*row_data, key=f"{row_key_prefix}{i}")
 
+            self._last_extract_key = extract_key
+            self._last_extract_page_key = page_key
         except Exception as e:
             logger.error(f"Failed to update data table with parser results: {e}", exc_info=True)
 
@@ -1,4 +1,4 @@
-DOM_STRING_INCLUDE_ATTRIBUTES = [
+DOM_STRING_INCLUDE_ATTRIBUTES = (
     "id",
     "class",
     "name",
@@ -17,4 +17,4 @@ DOM_STRING_INCLUDE_ATTRIBUTES = [
     "data-cy",
     "data-qa",
     # NOTE: Add other relevant attributes like 'pattern', 'required', 'disabled', etc. if needed
-]
+)
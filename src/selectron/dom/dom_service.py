@@ -1,4 +1,5 @@
 import logging
+from functools import cache
 from importlib import resources
 from typing import Optional, Protocol
 
@@ -30,12 +31,18 @@ class BrowserExecutor(Protocol):
     async def __aexit__(self, exc_type, exc_val, exc_tb): ...
 
 
+@cache
+def _build_dom_tree_js() -> str:
+    # read once per process, a DomService is built for every page navigation
+    return resources.files("selectron.dom").joinpath("buildDomTree.js").read_text()
+
+
 class DomService:
     def __init__(self, browser_executor: BrowserExecutor):
         self.browser_executor = browser_executor
         # self.xpath_cache = {} # This cache seems unused, consider removing later?
 
-        self.js_code = resources.files("selectron.dom").joinpath("buildDomTree.js").read_text()
+        self.js_code = _build_dom_tree_js()
 
     async def get_elements(
         self,
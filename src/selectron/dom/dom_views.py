@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from functools import cached_property
-from typing import TYPE_CHECKING, Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
 
 # Import from history_tree_views
 from selectron.dom.history_tree_views import (
@@ -13,6 +13,22 @@ from selectron.dom.history_tree_views import (
 if TYPE_CHECKING:
     from .dom_views import DOMElementNode
 
+# Basic attributes rendered for every visible element (built once, not per node)
+_BASIC_ATTRIBUTES = (
+    "id",
+    "class",
+    "role",
+    "name",
+    "data-testid",
+    "aria-label",
+    "placeholder",
+    "title",
+    "alt",
+    "href",
+    "type",
+    "for",
+)
+
 
 @dataclass(frozen=False)
 class DOMBaseNode:
@@ -156,7 +172,7 @@ class DOMElementNode(DOMBaseNode):
         collect_text(self, 0)
         return "\n".join(text_parts).strip()
 
-    def elements_to_string(self, include_attributes: list[str] | None = None) -> str:
+    def elements_to_string(self, include_attributes: Sequence[str] | None = None) -> str:
         """Convert the processed DOM content to a simplified string representation."""
         formatted_text = []
 
@@ -172,21 +188,7 @@ class DOMElementNode(DOMBaseNode):
                 attributes_to_include = {}
 
                 # Basic attributes for all visible elements for context
-                basic_attrs = [
-                    "id",
-                    "class",
-                    "role",
-                    "name",
-                    "data-testid",
-                    "aria-label",
-                    "placeholder",
-                    "title",
-                    "alt",
-                    "href",
-                    "type",
-                    "for",
-                ]
-                for attr_name in basic_attrs:
+                for attr_name in _BASIC_ATTRIBUTES:
                     if attr_name in node.attributes and node.attributes[attr_name]:
                         attributes_to_include[attr_name] = str(node.attributes[attr_name])
 
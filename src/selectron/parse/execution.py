@@ -1,8 +1,13 @@
+import ast
+import copy
 import json
+import re
 import reprlib
-from typing import Any, Dict, List
+from types import CodeType
+from typing import Any, Dict, List, Optional, Union
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+from bs4.builder import ParserRejectedMarkup
 
 from selectron.util.logger import get_logger
 
@@ -10,6 +15,98 @@ from .types import ParseOutcome, ParserError, ParseSuccess
 
 logger = get_logger(__name__)
 
+# C-backed libxml2 tree builder; several times faster than bs4's pure-python "html.parser"
+SANDBOX_SOUP_FEATURES = "lxml"
+
+
+def sandbox_beautifulsoup(markup: Any = "", features: Any = SANDBOX_SOUP_FEATURES, *args, **kwargs):
+    """`BeautifulSoup` as seen by parser code: lxml unless the caller names a parser."""
+    try:
+        return BeautifulSoup(markup, features, *args, **kwargs)
+    except (FeatureNotFound, ParserRejectedMarkup):
+        if features != SANDBOX_SOUP_FEATURES:
+            raise
+        return BeautifulSoup(markup, "html.parser", *args, **kwargs)
+
+
+def compile_parser_code(
+    python_code: Union[str, ast.Module], filename: str = "<parser_code>"
+) -> CodeType:
+    """Compile parser source (or its already-parsed AST) the same way for codegen and runtime.
+
+    `dont_inherit` keeps this module's `__future__` flags out of the parser's code, and
+    `optimize=2` drops asserts and docstrings from the per-element hot path.
+    """
+    return compile(python_code, filename, "exec", dont_inherit=True, optimize=2)
+
+
+# globals every parser sees; `re` is pre-bound since nearly every parser imports it
+_SANDBOX_PROTO: Dict[str, Any] = {
+    "BeautifulSoup": sandbox_beautifulsoup,
+    "SoupStrainer": SoupStrainer,
+    "json": json,
+    "re": re,
+}
+
+
+def parser_sandbox(soup_cache: Optional[Dict[str, BeautifulSoup]] = None) -> Dict[str, Any]:
+    """Fresh globals for exec-ing parser code (shared by codegen validation and runtime).
+
+    `soup_cache` maps markup to a tree already built by `sandbox_beautifulsoup`; parsing that
+    exact markup with the default features then returns a copy instead of re-parsing it.
+    """
+    sandbox = _SANDBOX_PROTO.copy()
+    if not soup_cache:
+        return sandbox
+
+    def cached_beautifulsoup(
+        markup: Any = "", features: Any = SANDBOX_SOUP_FEATURES, *args, **kwargs
+    ):
+        if features == SANDBOX_SOUP_FEATURES and not args and not kwargs:
+            tree = soup_cache.get(markup) if isinstance(markup, str) else None
+            if tree is not None:
+                return copy.copy(tree)  # a copy, so parser code mutating it can't taint the cache
+        return sandbox_beautifulsoup(markup, features, *args, **kwargs)
+
+    sandbox["BeautifulSoup"] = cached_beautifulsoup
+    return sandbox
+
+
+# Per-process state for run_parser_code: exec'd parsers by source, parsed trees by html
+_WORKER_CACHE_SIZE = 64
+_worker_parse_fns: Dict[str, Any] = {}
+_worker_soup_cache: Dict[str, BeautifulSoup] = {}
+
+
+class ParserCodeError(Exception):
+    """Parser code failed before `parse_element` could be called (the message is the feedback)."""
+
+
+def run_parser_code(python_code: str, html: str) -> Any:
+    """Call `parse_element(html)` from `python_code`; the unit of work for a process pool.
+
+    Each worker process execs a given source once and parses a given html once, so repeated
+    calls across codegen iterations only pay for `parse_element` itself.
+    """
+    if html not in _worker_soup_cache:
+        if len(_worker_soup_cache) >= _WORKER_CACHE_SIZE:
+            _worker_soup_cache.clear()
+        _worker_soup_cache[html] = sandbox_beautifulsoup(html)
+    parse_fn = _worker_parse_fns.get(python_code)
+    if parse_fn is None:
+        sandbox = parser_sandbox(_worker_soup_cache)
+        try:
+            exec(compile_parser_code(python_code), sandbox)
+        except Exception as e:
+            raise ParserCodeError(f"runtime error during exec: {type(e).__name__}: {e}") from e
+        parse_fn = sandbox.get("parse_element")
+        if not callable(parse_fn):
+            raise ParserCodeError("function `parse_element(html: str) -> dict` not found")
+        if len(_worker_parse_fns) >= _WORKER_CACHE_SIZE:
+            _worker_parse_fns.clear()
+        _worker_parse_fns[python_code] = parse_fn
+    return parse_fn(html)
+
 
 def execute_parser_on_html(html_content: str, selector: str, python_code: str) -> ParseOutcome:
     """
@@ -29,9 +126,9 @@ def execute_parser_on_html(html_content: str, selector: str, python_code: str) -
     results: List[Dict[str, Any]] = []
 
     # Prepare sandbox for executing the parser's Python code
-    sandbox: Dict[str, Any] = {"BeautifulSoup": BeautifulSoup, "json": json}
+    sandbox = parser_sandbox()
     try:
-        exec(python_code, sandbox)
+        exec(compile_parser_code(python_code), sandbox)
     except Exception as e:
         msg = f"Parser Python code execution error during exec: {e}"
         logger.error(msg, exc_info=True)
@@ -0,0 +1,51 @@
+import re
+from functools import lru_cache
+
+from bs4 import BeautifulSoup, Comment, NavigableString, Tag
+
+# never hold data a parser would extract
+_DROP_TAGS = ["script", "style", "noscript", "template"]
+# kept (class, aria-label, ... stay selectable) but their drawing instructions are dropped
+_EMPTY_TAGS = ["svg"]
+_DROP_ATTRS = ("style", "srcset")
+# whitespace is significant inside these
+_PRESERVE_WHITESPACE = {"pre", "textarea"}
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=256)
+def compact_html(html_string: str) -> str:
+    """shrink html for display to an llm: drop markup that carries no extractable data.
+
+    removes scripts/styles/comments, empties svgs, drops inline style/srcset, abbreviates
+    data: uris and collapses whitespace runs. only for prompts – parsers still run on the original.
+    """
+    soup = BeautifulSoup(html_string, "html.parser")
+
+    for tag in soup.find_all(_DROP_TAGS):
+        tag.decompose()
+    for tag in soup.find_all(_EMPTY_TAGS):
+        if isinstance(tag, Tag):
+            tag.clear()
+    for comment in soup.find_all(string=lambda s: isinstance(s, Comment)):
+        comment.extract()
+
+    for tag in soup.find_all(True):
+        if not isinstance(tag, Tag):
+            continue
+        for attr in _DROP_ATTRS:
+            tag.attrs.pop(attr, None)
+        src = tag.attrs.get("src")
+        if isinstance(src, str) and src.startswith("data:"):
+            tag.attrs["src"] = src.split(",", 1)[0] + ",…"  # keep the media type only
+
+    for text in soup.find_all(string=True):
+        if type(text) is not NavigableString:  # CData, Doctype, ...
+            continue
+        if any(parent.name in _PRESERVE_WHITESPACE for parent in text.parents):
+            continue
+        collapsed = _WHITESPACE.sub(" ", text)
+        if collapsed != text:
+            text.replace_with(collapsed)
+
+    return str(soup)
@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from platformdirs import user_config_dir
+from platformdirs import user_cache_dir, user_config_dir
 
 APP_DIR_NAME = "selectron"
 
@@ -9,3 +9,9 @@ def get_app_dir() -> Path:
     app_dir = Path(user_config_dir(APP_DIR_NAME))
     app_dir.mkdir(parents=True, exist_ok=True)
     return app_dir
+
+
+def get_cache_dir() -> Path:
+    cache_dir = Path(user_cache_dir(APP_DIR_NAME))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
@@ -0,0 +1,37 @@
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pydantic_core
+
+from selectron.util.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def read_cache_entry(cache_path: Path) -> Optional[Dict[str, Any]]:
+    """Read a JSON cache entry (under get_cache_dir()); missing or unreadable entries are None."""
+    try:
+        if not cache_path.is_file():
+            return None
+        entry = pydantic_core.from_json(cache_path.read_bytes())
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable cache entry {cache_path}: {e}")
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def write_cache_entry(cache_path: Path, entry: Dict[str, Any], max_entries: int) -> None:
+    """Write a JSON cache entry, evicting the oldest entries in its directory beyond max_entries.
+
+    Blocking file I/O: call it from a worker thread when on the event loop.
+    """
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(pydantic_core.to_json(entry))
+        entries = list(cache_path.parent.glob("*.json"))
+        if len(entries) > max_entries:
+            entries.sort(key=lambda p: p.stat().st_mtime)
+            for stale in entries[: len(entries) - max_entries]:
+                stale.unlink(missing_ok=True)
+    except Exception as e:
+        logger.warning(f"Failed to write cache entry {cache_path}: {e}")
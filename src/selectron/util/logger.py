@@ -1,5 +1,8 @@
 import logging
+import multiprocessing
 
+from rich import get_console
+from rich.highlighter import NullHighlighter
 from rich.logging import RichHandler
 
 from selectron.util.get_app_dir import get_app_dir
@@ -24,15 +27,26 @@ def get_logger(name: str) -> logging.Logger:
             fmt="%(asctime)s [%(levelname)-5s] [%(name)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
         )
 
+        # Use write mode to clear on start; spawned worker processes import the app as well,
+        # and must append rather than wipe the running app's log
+        is_worker = multiprocessing.current_process().name != "MainProcess"
         _file_handler = logging.FileHandler(
-            LOG_FILE, mode="w", encoding="utf-8"
-        )  # Use write mode to clear on start
+            LOG_FILE, mode="a" if is_worker else "w", encoding="utf-8"
+        )
         _file_handler.setFormatter(log_formatter)
         _file_handler.setLevel(logging.DEBUG)
         root_logger.addHandler(_file_handler)
 
         # stream handler (for terminal visibility, using rich)
-        stream_handler = RichHandler(level=logging.DEBUG, rich_tracebacks=True, show_path=False)
+        # pygments-highlighted tracebacks and per-record highlighting only pay off on a terminal
+        is_terminal = get_console().is_terminal
+        stream_handler = RichHandler(
+            level=logging.DEBUG,
+            rich_tracebacks=is_terminal,
+            tracebacks_max_frames=10,
+            highlighter=None if is_terminal else NullHighlighter(),
+            show_path=False,
+        )
         root_logger.addHandler(stream_handler)
 
         # Set library levels
@@ -42,6 +56,7 @@ def get_logger(name: str) -> logging.Logger:
         logging.getLogger("openai").setLevel(logging.WARNING)
         logging.getLogger("markdown_it").setLevel(logging.WARNING)
         logging.getLogger("PIL").setLevel(logging.WARNING)
+        logging.getLogger("watchfiles").setLevel(logging.WARNING)
 
         _initialized = True
 
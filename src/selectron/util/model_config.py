@@ -1,6 +1,9 @@
 import os
 from typing import Literal, Optional
 
+from pydantic_ai.models.anthropic import AnthropicModelSettings
+from pydantic_ai.settings import ModelSettings
+
 Provider = Literal["anthropic", "openai"]
 
 CLAUDE_3_5_SONNET = "anthropic:claude-3-5-sonnet-latest"
@@ -14,6 +17,12 @@ ANTHROPIC_CODEGEN_MODEL = CLAUDE_3_7_SONNET
 OPENAI_ANALYZE_MODEL = OPENAI_GPT_4_1_MINI
 OPENAI_SELECTOR_MODEL = OPENAI_GPT_4_1
 OPENAI_CODEGEN_MODEL = OPENAI_GPT_4_1
+# Prompt-caching settings; older pydantic_ai releases don't know them, so only those present are sent
+ANTHROPIC_CACHE_SETTINGS = (
+    "anthropic_cache_instructions",
+    "anthropic_cache_tool_definitions",
+    "anthropic_cache",
+)
 
 
 class ModelConfig:
@@ -69,6 +78,18 @@ class ModelConfig:
             raise ValueError("AI provider not configured, cannot get codegen model.")
         return self._codegen_model
 
+    @property
+    def model_settings(self) -> Optional[ModelSettings]:
+        """Per-request settings for agent runs: prompt caching across turns where it's opt-in."""
+        if self.provider == "anthropic":
+            # system prompt + tools are identical on every turn; the rest of the conversation
+            # (tool results carrying the HTML samples) only grows, so each turn reuses the last
+            supported = AnthropicModelSettings.__annotations__
+            cache_settings = {key: True for key in ANTHROPIC_CACHE_SETTINGS if key in supported}
+            return AnthropicModelSettings(**cache_settings) if cache_settings else None
+        # OpenAI caches long prompt prefixes automatically
+        return None
+
     @property
     def api_key(self) -> str:
         """Returns the API key for the selected provider."""
@@ -16,64 +16,54 @@ def sample_items(
     Prioritizes sampling one item of each distinct key shape (frozenset of keys)
     before randomly sampling remaining items up to `sample_size`.
     Useful for getting a varied preview of data structures.
-    Skips items that are not JSON-serializable during shape calculation.
+    Skips items that are not JSON-serializable.
     """
     if not items or sample_size <= 0:
         return []
 
-    sampled_item_tuples: List[Tuple[int, Dict[str, Any]]] = []
-    items_by_shape: Dict[frozenset[str], List[Dict[str, Any]]] = defaultdict(list)
-
-    # Group items by their key structure (shape)
-    serializable_items_indices: List[int] = []
-    for idx, item_dict in enumerate(items):
+    def is_serializable(idx: int) -> bool:
         try:
-            # Use JSON dumps with sort_keys for a canonical shape representation
-            # This also implicitly checks serializability
-            _ = json.dumps(item_dict, sort_keys=True)
-            shape = frozenset(item_dict.keys())
-            items_by_shape[shape].append(item_dict)
-            serializable_items_indices.append(idx)
+            # sort_keys matches the canonical dump (mixed-type keys fail there too)
+            _ = json.dumps(items[idx], sort_keys=True)
         except TypeError:
             logger.debug(f"skipping non-serializable item at index {idx} during sampling")
-            continue
+            return False
+        return True
 
-    if not items_by_shape:
-        logger.warning("no json-serializable items found for sampling")
-        return []
+    # Group item indices by their key structure (shape); serializability is only checked
+    # for items we are about to pick, so a small sample of a long list stays cheap
+    indices_by_shape: Dict[frozenset[str], List[int]] = defaultdict(list)
+    for idx, item_dict in enumerate(items):
+        indices_by_shape[frozenset(item_dict.keys())].append(idx)
+
+    sampled_item_tuples: List[Tuple[int, Dict[str, Any]]] = []
+    sampled_indices: set[int] = set()
 
     # Prioritize one sample from each distinct shape
-    distinct_shapes = list(items_by_shape.keys())
+    distinct_shapes = list(indices_by_shape.keys())
     random.shuffle(distinct_shapes)
-    sampled_indices: set[int] = set()
     for shape in distinct_shapes:
         if len(sampled_item_tuples) >= sample_size:
             break
-        chosen_item = random.choice(items_by_shape[shape])
-        # Find the first original index of this chosen item
-        try:
-            original_index = items.index(chosen_item)
-            sampled_item_tuples.append((original_index, chosen_item))
-            sampled_indices.add(original_index)  # Add index to sampled set
-        except ValueError:
-            # Should not happen if chosen_item came from items_by_shape
-            logger.warning(f"chosen item not found in original list: {chosen_item}")
-
-        # Avoid re-sampling the exact same item later if possible
-        # by removing it from the pool if multiple items had the same shape
-        items_by_shape[shape].remove(chosen_item)
-        if not items_by_shape[shape]:
-            del items_by_shape[shape]  # remove shape if list is empty
+        shape_indices = indices_by_shape[shape]
+        random.shuffle(shape_indices)
+        # first serializable index in shuffled order: a uniform pick among them
+        chosen_index = next((i for i in shape_indices if is_serializable(i)), None)
+        if chosen_index is not None:
+            sampled_item_tuples.append((chosen_index, items[chosen_index]))
+            sampled_indices.add(chosen_index)
 
     # If still below sample_size, add more random items by index
     if len(sampled_item_tuples) < sample_size:
-        # Find indices of serializable items that haven't been sampled yet
-        available_indices = [i for i in serializable_items_indices if i not in sampled_indices]
+        available_indices = [i for i in range(len(items)) if i not in sampled_indices]
         random.shuffle(available_indices)
+        for idx_to_add in available_indices:
+            if len(sampled_item_tuples) >= sample_size:
+                break
+            if is_serializable(idx_to_add):
+                # Add the item by its index, allowing identical values
+                sampled_item_tuples.append((idx_to_add, items[idx_to_add]))
 
-        needed = sample_size - len(sampled_item_tuples)
-        for idx_to_add in available_indices[:needed]:
-            # Add the item by its index, allowing identical values
-            sampled_item_tuples.append((idx_to_add, items[idx_to_add]))
-
+    if not sampled_item_tuples:
+        logger.warning("no json-serializable items found for sampling")
     return sampled_item_tuples
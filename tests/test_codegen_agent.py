@@ -0,0 +1,179 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from selectron.ai import codegen_agent
+from selectron.ai.codegen_agent import CodegenAgent
+
+SAMPLES = ['<div><a href="/x">T0</a></div>', '<div><a href="/y">T1</a></div>']
+GOOD_CODE = (
+    "def parse_element(html):\n"
+    "    soup = BeautifulSoup(html, 'lxml')\n"
+    "    a = soup.find('a')\n"
+    "    return {'title': a.get_text(), 'primary_url': a['href']}\n"
+)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(codegen_agent, "get_cache_dir", lambda: tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def agent(cache_dir):
+    return CodegenAgent(html_samples=SAMPLES)
+
+
+def test_exec_candidate_runs_samples_in_workers(agent):
+    ok, feedback, outputs = agent._exec_candidate(GOOD_CODE, SAMPLES + SAMPLES[:1])
+    assert ok, feedback
+    assert [o["title"] for o in outputs] == ["T0", "T1", "T0"]
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "def parse_element(html):\n    while True:\n        pass\n",
+        # module-level code runs under the same deadline as parse_element
+        "while True:\n    pass\n\ndef parse_element(html):\n    return {}\n",
+    ],
+)
+def test_looping_candidate_fails_within_budget(agent, monkeypatch, code):
+    monkeypatch.setattr(codegen_agent, "CANDIDATE_TIMEOUT_S", 2.0)
+    threads_before = set(threading.enumerate())
+    children_before = set(multiprocessing.active_children())
+
+    started = time.monotonic()
+    ok, feedback, outputs = agent._exec_candidate(code, SAMPLES)
+    assert time.monotonic() - started < 2.0 + 3.0  # budget plus worker start/teardown
+    assert not ok and outputs == []
+    assert "did not finish" in feedback
+
+    # the runaway workers are gone, and nothing is left running that exit would wait for
+    assert set(multiprocessing.active_children()) <= children_before
+    assert set(threading.enumerate()) <= threads_before
+
+
+def test_exec_error_is_reported_as_feedback(agent):
+    ok, feedback, _ = agent._exec_candidate(
+        "x = 1 / 0\n\ndef parse_element(html):\n    return {}\n", SAMPLES
+    )
+    assert not ok
+    assert feedback == "runtime error during exec: ZeroDivisionError: division by zero"
+
+
+def test_candidate_output_does_not_reach_the_terminal(agent, capfd):
+    # fresh workers, so they inherit the captured fds rather than the session's
+    idle = codegen_agent._checkout_sample_workers(len(codegen_agent._idle_sample_workers))
+    codegen_agent._terminate_sample_workers(idle)
+    noisy = "import sys, warnings\n\n" + GOOD_CODE.replace(
+        "    soup =",
+        "    print('LEAK-FROM-WORKER')\n"
+        "    print('LEAK-FROM-WORKER', file=sys.stderr)\n"
+        "    warnings.warn('LEAK-FROM-WORKER')\n"
+        "    soup =",
+    )
+
+    ok, feedback, _ = agent._exec_candidate(noisy, SAMPLES)
+    assert ok, feedback
+    out, err = capfd.readouterr()
+    assert "LEAK-FROM-WORKER" not in out + err
+
+
+def test_runaway_candidate_does_not_fail_a_concurrent_one(agent, monkeypatch):
+    """Parallel tool calls: killing one candidate's workers leaves the other's running."""
+    monkeypatch.setattr(codegen_agent, "CANDIDATE_TIMEOUT_S", 3.0)
+    monkeypatch.setattr(codegen_agent, "_SAMPLE_WORKERS", 4)
+    codegen_agent._warm_up_sample_workers(4)  # keep worker start-up out of the timing
+    # sleeps rather than spins, so the test doesn't depend on spare cores
+    looping = "import time\n\ndef parse_element(html):\n    while True:\n        time.sleep(0.05)\n"
+    slow_good = "import time\n\n" + GOOD_CODE.replace(
+        "    soup =", "    time.sleep(1.5)\n    soup ="
+    )
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        runaway = pool.submit(agent._exec_candidate, looping, SAMPLES)
+        time.sleep(2.0)  # the good candidate is mid-sleep when the runaway one is killed
+        good = pool.submit(agent._exec_candidate, slow_good, SAMPLES)
+        assert not runaway.result()[0]
+        ok, feedback, outputs = good.result()
+    assert ok, feedback
+    assert [o["title"] for o in outputs] == ["T0", "T1"]
+
+
+class _Cfg:
+    codegen_model = "test"
+    model_settings = None
+
+
+def _run_agent(samples, **kwargs):
+    return CodegenAgent(html_samples=samples, model_cfg=_Cfg(), base_url="https://x.test", **kwargs)
+
+
+def test_run_cache_hit_ignores_sample_order(cache_dir):
+    first = _run_agent(SAMPLES, input_selector="div")
+    outputs = [{"title": "T0"}, {"title": "T1"}]
+    first._store_cached_run(first._run_cache_path(), GOOD_CODE, outputs)
+
+    reordered = _run_agent(SAMPLES[::-1], input_selector="div")
+    assert reordered._run_cache_path() == first._run_cache_path()
+    # outputs come back in the new run's sample order
+    assert reordered._load_cached_run(reordered._run_cache_path()) == (GOOD_CODE, outputs[::-1])
+
+
+def test_run_cache_misses_on_changed_inputs(cache_dir, monkeypatch):
+    cached = _run_agent(SAMPLES, input_selector="div")
+    cached._store_cached_run(cached._run_cache_path(), GOOD_CODE, [{"a": 1}, {"a": 2}])
+    path = cached._run_cache_path()
+
+    assert _run_agent(SAMPLES, input_selector="a")._run_cache_path() != path
+    assert _run_agent(SAMPLES[:1], input_selector="div")._run_cache_path() != path
+    other_model = _run_agent(SAMPLES, input_selector="div")
+    other_model.model_cfg.codegen_model = "other"
+    assert other_model._run_cache_path() != path
+    # separate contexts: undoing the fixture's patches would point the cache at the real one
+    with monkeypatch.context() as patch:
+        patch.setattr(codegen_agent, "CODEGEN_PROMPT", codegen_agent.CODEGEN_PROMPT + "!")
+        assert _run_agent(SAMPLES, input_selector="div")._run_cache_path() != path
+    with monkeypatch.context() as patch:
+        patch.setattr(codegen_agent, "CODEGEN_RUN_CACHE_VERSION", -1)
+        assert _run_agent(SAMPLES, input_selector="div")._run_cache_path() != path
+    assert _run_agent(SAMPLES, input_selector="div")._run_cache_path() == path
+    assert path.parent.parent == cache_dir
+
+
+def test_run_reuses_the_cached_parser_unless_bypassed(cache_dir, monkeypatch):
+    generated = []
+
+    async def generate(self):
+        generated.append(self.use_cache)
+        return GOOD_CODE, [{"title": "T0"}, {"title": "T1"}]
+
+    monkeypatch.setattr(CodegenAgent, "_generate", generate)
+    first = asyncio.run(_run_agent(SAMPLES, input_selector="div").run())
+    assert asyncio.run(_run_agent(SAMPLES, input_selector="div").run()) == first
+    assert generated == [True]
+    # a regenerate skips the cached parser
+    asyncio.run(_run_agent(SAMPLES, input_selector="div", use_cache=False).run())
+    assert generated == [True, False]
+
+
+def test_candidate_cache_hit_skips_workers(agent, monkeypatch):
+    ok, _, outputs = agent._exec_candidate(GOOD_CODE, SAMPLES)
+    assert ok
+
+    def no_workers(count):
+        raise AssertionError("cached candidate must not run")
+
+    monkeypatch.setattr(codegen_agent, "_checkout_sample_workers", no_workers)
+    assert agent._exec_candidate(GOOD_CODE, SAMPLES) == (True, "success", outputs)
+    # other code, or other samples, miss
+    with pytest.raises(AssertionError, match="must not run"):
+        agent._exec_candidate(GOOD_CODE + "\n", SAMPLES)
+    with pytest.raises(AssertionError, match="must not run"):
+        agent._exec_candidate(GOOD_CODE, SAMPLES[:1])
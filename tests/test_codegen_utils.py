@@ -1,12 +1,16 @@
+import ast
+
 from selectron.ai.codegen_utils import (
     _check_word_repetition,
     _flatten,
     clean_agent_code,
+    key_columns,
     validate_cross_key_duplicates,
     validate_empty_columns,
     validate_identical_columns,
     validate_internal_repetition,
     validate_naive_text_match,
+    validate_parser_code_shape,
     validate_redundant_key_pairs,
     validate_result,
     validate_text_representation,
@@ -52,6 +56,27 @@ def test_flatten_non_iterable():
     assert _flatten(None) == []
 
 
+# --- Tests for key_columns ---
+
+
+def test_key_columns_pivots_by_output_index():
+    outputs = [{"a": 1, "b": ""}, {"b": "x"}, {"a": 3}]
+    assert key_columns(outputs) == {"a": {0: 1, 2: 3}, "b": {0: "", 1: "x"}}
+
+
+def test_validators_accept_precomputed_columns():
+    outputs = [{"a": "", "b": "same", "c": "v1"}, {"a": None, "b": "same", "c": "v1"}]
+    keys = {"a", "b", "c"}
+    columns = key_columns(outputs)
+    assert validate_empty_columns(outputs, keys, columns) == validate_empty_columns(outputs, keys)
+    assert validate_identical_columns(outputs, keys, columns) == validate_identical_columns(
+        outputs, keys
+    )
+    assert validate_redundant_key_pairs(outputs, keys, columns) == validate_redundant_key_pairs(
+        outputs, keys
+    )
+
+
 # --- Tests for validate_empty_columns ---
 
 
@@ -626,6 +651,14 @@ def test_clean_agent_code_whitespace():
     assert clean_agent_code(code) == expected
 
 
+def test_clean_agent_code_opening_fence_only():
+    assert clean_agent_code("```python\ndef parse(): pass") == "def parse(): pass"
+
+
+def test_clean_agent_code_closing_fence_only():
+    assert clean_agent_code("def parse(): pass\n```") == "def parse(): pass"
+
+
 # --- Tests for validate_result ---
 
 
@@ -707,3 +740,48 @@ def test_validate_result_invalid_list_item_dict_key():
     assert "invalid item at index 0" in msg
     assert "int" in msg
     assert "invalid internal types" in msg
+
+
+# --- Tests for validate_parser_code_shape ---
+
+
+def _shape(code: str):
+    return validate_parser_code_shape(ast.parse(code))
+
+
+def test_validate_parser_code_shape_ok():
+    code = "import re\n\ndef parse_element(html):\n    print('debug')\n    return {}\n"
+    assert _shape(code) is None
+
+
+def test_validate_parser_code_shape_missing_function():
+    assert "not found" in (_shape("def parse(html):\n    return {}\n") or "")
+
+
+def test_validate_parser_code_shape_accepts_other_bindings():
+    assert _shape("parse_element = lambda html: {'a': html}\n") is None
+
+
+def test_validate_parser_code_shape_bad_signature():
+    assert "only required argument" in (_shape("def parse_element():\n    return {}\n") or "")
+    assert "only required argument" in (_shape("def parse_element(a, b):\n    return {}\n") or "")
+    assert _shape("def parse_element(html, strict=False):\n    return {}\n") is None
+
+
+def test_validate_parser_code_shape_module_level_io():
+    code = "print('hi')\n\ndef parse_element(html):\n    return {}\n"
+    assert "`print()`" in (_shape(code) or "")
+
+
+def test_validate_parser_code_shape_network_import():
+    code = "def parse_element(html):\n    import requests\n    return {}\n"
+    assert "`requests`" in (_shape(code) or "")
+    code = "from urllib.request import urlopen\n\ndef parse_element(html):\n    return {}\n"
+    assert "`urllib.request`" in (_shape(code) or "")
+    code = "from urllib.parse import urljoin\n\ndef parse_element(html):\n    return {}\n"
+    assert _shape(code) is None
+
+
+def test_validate_parser_code_shape_dynamic_code():
+    code = "def parse_element(html):\n    return eval(html)\n"
+    assert "`eval()` (line 2)" in (_shape(code) or "")
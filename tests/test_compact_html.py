@@ -0,0 +1,36 @@
+import pytest
+
+from selectron.util.compact_html import compact_html
+
+
+@pytest.mark.parametrize(
+    "html_input, expected_output",
+    [
+        # Scripts, styles and comments carry nothing to extract
+        (
+            "<div><script>var x = 1;</script><style>.a{}</style><!-- c --><p>Text</p></div>",
+            "<div><p>Text</p></div>",
+        ),
+        # Svg stays selectable by its attributes, its drawing does not
+        (
+            '<div><svg aria-label="Like" class="icon"><path d="M1 2L3 4"></path></svg></div>',
+            '<div><svg aria-label="Like" class="icon"></svg></div>',
+        ),
+        # Inline style/srcset dropped, data: uris abbreviated, other attributes kept
+        (
+            '<img alt="a" src="data:image/png;base64,AAAA" srcset="x.png 2x" style="color:red">',
+            '<img alt="a" src="data:image/png;base64,…"/>',
+        ),
+        (
+            '<img src="https://example.com/a.png">',
+            '<img src="https://example.com/a.png"/>',
+        ),
+        # Whitespace runs collapse outside <pre>
+        (
+            "<div>\n   <span>a \n\t b</span>\n</div><pre>keep\n  this</pre>",
+            "<div> <span>a b</span> </div><pre>keep\n  this</pre>",
+        ),
+    ],
+)
+def test_compact_html(html_input, expected_output):
+    assert compact_html(html_input) == expected_output
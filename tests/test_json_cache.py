@@ -0,0 +1,27 @@
+import os
+
+from selectron.util.json_cache import read_cache_entry, write_cache_entry
+
+
+def test_round_trip_and_missing_entries(tmp_path):
+    cache_path = tmp_path / "entries" / "a.json"
+    assert read_cache_entry(cache_path) is None
+    write_cache_entry(cache_path, {"outputs": [{"title": "x"}]}, max_entries=4)
+    assert read_cache_entry(cache_path) == {"outputs": [{"title": "x"}]}
+
+
+def test_unreadable_or_non_object_entries_are_ignored(tmp_path):
+    corrupt, listed = tmp_path / "corrupt.json", tmp_path / "list.json"
+    corrupt.write_text("{not json")
+    listed.write_text("[1, 2]")
+    assert read_cache_entry(corrupt) is None
+    assert read_cache_entry(listed) is None
+
+
+def test_write_evicts_the_oldest_entries_beyond_the_cap(tmp_path):
+    for i in range(3):
+        path = tmp_path / f"{i}.json"
+        write_cache_entry(path, {"i": i}, max_entries=3)
+        os.utime(path, (i, i))  # distinct mtimes, oldest first
+    write_cache_entry(tmp_path / "3.json", {"i": 3}, max_entries=3)
+    assert sorted(p.name for p in tmp_path.glob("*.json")) == ["1.json", "2.json", "3.json"]
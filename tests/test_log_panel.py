@@ -0,0 +1,30 @@
+import pytest
+
+from selectron.cli.log_panel import _filter_info_or_higher, _is_info_or_higher
+
+
+@pytest.mark.parametrize(
+    "log_line, expected",
+    [
+        ("2025-01-01 12:00:00 [DEBUG] [selectron.x] msg\n", False),
+        ("2025-01-01 12:00:00 [INFO ] [selectron.x] msg\n", True),
+        ("2025-01-01 12:00:00 [WARNING] [selectron.x] msg\n", True),
+        ("2025-01-01 12:00:00 [INFO ] [selectron.x] saw [DEBUG] in text\n", True),
+        ("Traceback (most recent call last):\n", True),
+        ("\n", True),
+    ],
+)
+def test_is_info_or_higher(log_line, expected):
+    assert _is_info_or_higher(log_line) is expected
+
+
+def test_filter_info_or_higher_drops_only_debug_records():
+    text = (
+        "2025-01-01 12:00:00 [INFO ] [a] one\n"
+        "2025-01-01 12:00:00 [DEBUG] [a] two\n"
+        "  continuation\n"
+        "2025-01-01 12:00:01 [ERROR] [a] three"
+    )
+    assert _filter_info_or_higher(text) == (
+        "2025-01-01 12:00:00 [INFO ] [a] one\n  continuation\n2025-01-01 12:00:01 [ERROR] [a] three"
+    )
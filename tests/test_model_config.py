@@ -0,0 +1,21 @@
+from selectron.util import model_config as mc
+
+
+def test_anthropic_settings_enable_prompt_caching(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "key")
+    settings = mc.ModelConfig().model_settings
+    assert settings == dict.fromkeys(mc.ANTHROPIC_CACHE_SETTINGS, True)
+
+
+def test_cache_settings_unknown_to_pydantic_ai_are_left_out(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "key")
+    monkeypatch.setattr(mc, "ANTHROPIC_CACHE_SETTINGS", ("anthropic_cache", "anthropic_no_such"))
+    assert mc.ModelConfig().model_settings == {"anthropic_cache": True}
+    monkeypatch.setattr(mc, "ANTHROPIC_CACHE_SETTINGS", ("anthropic_no_such",))
+    assert mc.ModelConfig().model_settings is None
+
+
+def test_openai_runs_without_extra_settings(monkeypatch):
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    monkeypatch.setenv("OPENAI_API_KEY", "key")
+    assert mc.ModelConfig().model_settings is None
@@ -0,0 +1,43 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from selectron.chrome.types import TabReference
+from selectron.cli import monitor_handler
+from selectron.cli.monitor_handler import MonitorEventHandler
+
+PARSER = {
+    "selector": "p",
+    "python": "def parse_element(html):\n    return {'html': html}\n",
+}
+
+
+def _handler():
+    highlighter = MagicMock()
+    highlighter.get_elements_html = AsyncMock(return_value=["<p>a</p>", "<p>b</p>"])
+    handler = MonitorEventHandler(
+        app=MagicMock(),
+        highlighter=highlighter,
+        url_label=MagicMock(),
+        data_table=MagicMock(),
+        prompt_input=MagicMock(),
+    )
+    return handler, highlighter
+
+
+def test_unchanged_page_skips_extract_until_invalidated(monkeypatch):
+    monkeypatch.setattr(monitor_handler, "save_parsed_results", lambda *_: None)
+    handler, highlighter = _handler()
+    tab_ref = TabReference(id="t1", url="https://example.com", html="<body>page</body>")
+
+    async def scenario():
+        await handler._apply_parser_extract(tab_ref, PARSER)
+        await handler._apply_parser_extract(tab_ref, PARSER)  # same page: nothing refetched
+        assert highlighter.get_elements_html.await_count == 1
+        assert handler._data_table.add_row.call_count == 2
+
+        handler.invalidate_extract()  # e.g. the table was cleared
+        await handler._apply_parser_extract(tab_ref, PARSER)
+        assert highlighter.get_elements_html.await_count == 2
+        assert handler._data_table.add_row.call_count == 4
+
+    asyncio.run(scenario())
@@ -2,6 +2,7 @@ import json
 from pathlib import Path
 
 from selectron.lib import parse
+from selectron.parse.execution import parser_sandbox
 from selectron.parse.types import ParserError, ParseSuccess  # Import result types
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
@@ -75,3 +76,46 @@ def test_parse_x_home():
     if "quoted_text" in tweet_data:
         assert isinstance(tweet_data["quoted_text"], str)
         # assert tweet_data["quoted_text"].startswith("I just don\u2019t understand how text could become self-aware")
+
+
+def test_sandbox_beautifulsoup_defaults_to_lxml():
+    """Parser code that omits the features argument gets lxml; an explicit choice is kept."""
+    soup_cls = parser_sandbox()["BeautifulSoup"]
+    assert soup_cls("<p>x</p>").builder.NAME == "lxml"
+    assert soup_cls("<p>x</p>", "html.parser").builder.NAME == "html.parser"
+    assert soup_cls("<p>x</p>").select_one("p").get_text() == "x"
+
+
+def test_parser_sandbox_soup_cache_returns_independent_copies():
+    markup = '<div><a href="/x">T</a></div>'
+    tree = parser_sandbox()["BeautifulSoup"](markup)
+    soup_cls = parser_sandbox({markup: tree})["BeautifulSoup"]
+
+    copied = soup_cls(markup)
+    assert copied is not tree and str(copied) == str(tree)
+    copied.a.decompose()  # mutating the copy must not reach the cached tree
+    assert tree.a is not None
+    assert soup_cls(markup, "html.parser").builder.NAME == "html.parser"
+
+
+def test_parser_sandbox_provides_soup_strainer():
+    sandbox = parser_sandbox()
+    exec(
+        "def parse_element(html):\n"
+        "    soup = BeautifulSoup(html, 'lxml', parse_only=SoupStrainer('a'))\n"
+        "    return {'links': [a['href'] for a in soup.find_all('a')]}\n",
+        sandbox,
+    )
+    html = '<div><p>skip</p><a href="/x">x</a><a href="/y">y</a></div>'
+    assert sandbox["parse_element"](html) == {"links": ["/x", "/y"]}
+
+
+def test_parser_sandbox_is_fresh_per_call():
+    first = parser_sandbox()
+    exec(
+        "import re\n\ndef parse_element(html):\n    return {'n': len(re.findall('a', html))}\n",
+        first,
+    )
+    assert "parse_element" not in parser_sandbox()  # exec'd globals never leak into the next
+    assert first["parse_element"]("aXa") == {"n": 2}
+    assert parser_sandbox()["re"] is first["re"]
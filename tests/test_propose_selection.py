@@ -0,0 +1,51 @@
+import io
+
+import pytest
+from PIL import Image
+from pydantic_ai import ModelRetry
+
+from selectron.ai import propose_selection as ps
+from selectron.ai.types import AutoProposal
+
+
+def test_proposal_cache_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(ps, "get_cache_dir", lambda: tmp_path)
+    image_bytes = ps._encode_jpeg(Image.new("RGBA", (8, 8)))
+    cache_path = ps._proposal_cache_path("openai:gpt-4.1-mini", image_bytes)
+    assert ps._load_cached_proposal(cache_path) is None
+
+    proposal = AutoProposal(proposed_description="All posts in the main feed")
+    ps._store_cached_proposal(cache_path, proposal)
+    assert ps._load_cached_proposal(cache_path) == proposal
+    # a different model (or screenshot) is a different entry
+    assert ps._proposal_cache_path("anthropic:claude", image_bytes) != cache_path
+
+
+def test_proposal_cache_ignores_corrupt_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(ps, "get_cache_dir", lambda: tmp_path)
+    cache_path = ps._proposal_cache_path("m", b"img")
+    cache_path.parent.mkdir(parents=True)
+    cache_path.write_text("{not json")
+    assert ps._load_cached_proposal(cache_path) is None
+
+
+def test_encode_jpeg_caps_the_longest_side():
+    screenshot = Image.new("RGB", (1200, 5000))
+    encoded = Image.open(io.BytesIO(ps._encode_jpeg(screenshot)))
+    assert max(encoded.size) == ps.PROPOSAL_IMAGE_MAX_SIDE
+    assert screenshot.size == (1200, 5000)  # the caller's image is left alone
+
+
+def test_require_description_sends_blank_answers_back():
+    with pytest.raises(ModelRetry):
+        ps._require_description(ps._ProposalResponse(description="  "))
+    response = ps._ProposalResponse(description="All posts")
+    assert ps._require_description(response) is response
+
+
+def test_proposal_cache_ignores_entries_of_another_shape(tmp_path, monkeypatch):
+    monkeypatch.setattr(ps, "get_cache_dir", lambda: tmp_path)
+    cache_path = ps._proposal_cache_path("m", b"img")
+    cache_path.parent.mkdir(parents=True)
+    cache_path.write_text('{"outputs": []}')
+    assert ps._load_cached_proposal(cache_path) is None
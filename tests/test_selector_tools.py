@@ -0,0 +1,71 @@
+import pytest
+from bs4 import BeautifulSoup
+from markdownify import markdownify
+
+from selectron.ai.selector_tools import _element_to_markdown, _simple_html_to_markdown
+
+
+@pytest.mark.parametrize(
+    "html_input",
+    [
+        "<span>Hello world</span>",
+        "<span> a  b_c*d </span>",
+        '<span class="x y">5 comments</span>',
+        "<label>x &amp; y</label>",
+        "<time>2 hours ago</time>",
+        "<div> padded </div>",
+        "<p>snake_case &lt;tag&gt;</p>",
+        '<a href="/item?id=1">Title_1</a>',
+        '<a href="/x"> spaced link </a>',
+        '<a href="http://example.com">http://example.com</a>',
+        '<a href="/x?a=1&amp;b=2">query</a>',
+        '<a href="/x"></a>',
+        # autolinks compare the escaped text: only "_" survives unescaped
+        '<a href="a*b">a*b</a>',
+        '<a href="a_b">a_b</a>',
+        '<a href="a\\_b">a_b</a>',
+        '<a href="a_b"> a_b </a>',
+    ],
+)
+def test_simple_html_to_markdown_matches_markdownify(html_input):
+    """The regex fast path must produce exactly what markdownify would."""
+    fast = _simple_html_to_markdown(html_input)
+    assert fast is not None
+    assert fast == markdownify(html_input, heading_style="ATX")
+
+
+@pytest.mark.parametrize(
+    "html_input",
+    [
+        "<div><span>nested</span></div>",
+        "<h1>Heading</h1>",
+        "<li>item</li>",
+        "<b>bold</b>",
+        '<a href="/x" title="t">titled</a>',
+        "<span>multi\nline</span>",
+        "<span>a&nbsp;b</span>",
+        "<span>odd &copy entity</span>",
+        "<span>" + "x" * 600 + "</span>",
+    ],
+)
+def test_simple_html_to_markdown_defers_to_markdownify(html_input):
+    assert _simple_html_to_markdown(html_input) is None
+
+
+@pytest.mark.parametrize(
+    "selector",
+    ["article", "h2", "p", "li", "a", "pre", "span.inner"],
+)
+def test_element_to_markdown_matches_markdownify_of_serialized_element(selector):
+    """Converting the parsed tag must equal re-parsing its HTML, regardless of page context."""
+    page = BeautifulSoup(
+        "<body><pre>keep <span class='inner'> spaced </span></pre>\n"
+        "<article> <h2>Title_1</h2>\n<p>Some <b>bold</b> and <a href='/x'>link</a> text</p>"
+        "<ul><li>one</li> <li>two</li></ul></article></body>",
+        "html.parser",
+    )
+    element = page.select_one(selector)
+    assert element is not None
+    assert _element_to_markdown(element, heading_style="ATX") == markdownify(
+        str(element), heading_style="ATX"
+    )